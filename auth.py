@@ -6,7 +6,8 @@ import hashlib
 import bcrypt
 import secrets
 import sqlite3
-from typing import Optional
+import orjson
+from typing import Any, Optional
 from pathlib import Path
 from collections import defaultdict
 
@@ -19,11 +20,15 @@ SESSION_TTL = 30 * 24 * 3600  # 30 days
 # --- Rate Limiting ---
 RATE_LIMIT_REQUESTS = 30
 RATE_LIMIT_WINDOW = 60
+RATE_LIMIT_SWEEP_EVERY = 1024  # full stale-bucket sweep at most once per this many checks...
+RATE_LIMIT_SWEEP_KEYS = 10_000  # ...or sooner once the table outgrows this many keys
 _rate_buckets: dict = defaultdict(list)
 _rate_check_counter = 0
+_rate_sweep_threshold = RATE_LIMIT_SWEEP_KEYS
 
 
 def rate_limit_check(ip: str) -> bool:
+    rate_limit_cleanup()
     now = time.time()
     cutoff = now - RATE_LIMIT_WINDOW
     _rate_buckets[ip] = [t for t in _rate_buckets[ip] if t > cutoff]
@@ -57,25 +62,62 @@ def get_rate_limit_key(request) -> str:
 
 
 def rate_limit_cleanup():
-    global _rate_check_counter
+    """Amortized sweep of stale buckets; called from rate_limit_check.
+
+    Each check already trims its own key, so the O(N) walk over all keys only
+    runs every RATE_LIMIT_SWEEP_EVERY checks or when the table grows past the
+    current threshold (which then doubles relative to the surviving keys).
+    """
+    global _rate_check_counter, _rate_sweep_threshold
     _rate_check_counter += 1
-    if _rate_check_counter % 100 == 0:
+    if _rate_check_counter % RATE_LIMIT_SWEEP_EVERY == 0 or len(_rate_buckets) > _rate_sweep_threshold:
         now = time.time()
         cutoff = now - RATE_LIMIT_WINDOW
         stale = [ip for ip, ts in _rate_buckets.items() if not ts or ts[-1] < cutoff]
         for ip in stale:
             del _rate_buckets[ip]
+        _rate_sweep_threshold = max(RATE_LIMIT_SWEEP_KEYS, 2 * len(_rate_buckets))
 
 
 # --- SQLite User DB ---
 DB_PATH = Path(__file__).parent / "sentsei.db"
 
 
+class _SharedConnection(sqlite3.Connection):
+    """The process-wide connection; close() is a no-op so callers can't tear it down."""
+
+    def close(self):
+        pass
+
+
+_db_conn: Optional[_SharedConnection] = None
+_db_conn_path: Optional[Path] = None
+
+
 def get_db() -> sqlite3.Connection:
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    return conn
+    """Return the shared SQLite connection, opening it on first use.
+
+    Reusing one connection keeps SQLite's page cache and prepared-statement
+    cache warm instead of re-opening the file on every request.
+    """
+    global _db_conn, _db_conn_path
+    if _db_conn is None or _db_conn_path != DB_PATH:
+        close_db()
+        conn = sqlite3.connect(str(DB_PATH), factory=_SharedConnection, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-20000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        _db_conn, _db_conn_path = conn, DB_PATH
+    return _db_conn
+
+
+def close_db():
+    global _db_conn, _db_conn_path
+    if _db_conn is not None:
+        sqlite3.Connection.close(_db_conn)
+    _db_conn, _db_conn_path = None, None
 
 
 def init_user_db():
@@ -95,6 +137,7 @@ def init_user_db():
             expires_at REAL NOT NULL,
             FOREIGN KEY (user_id) REFERENCES users(id)
         );
+        CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at);
         CREATE TABLE IF NOT EXISTS user_data (
             user_id INTEGER NOT NULL,
             data_key TEXT NOT NULL,
@@ -103,8 +146,86 @@ def init_user_db():
             PRIMARY KEY (user_id, data_key),
             FOREIGN KEY (user_id) REFERENCES users(id)
         );
+        CREATE TABLE IF NOT EXISTS srs_items (
+            user_id INTEGER NOT NULL,
+            sentence TEXT NOT NULL,
+            lang TEXT NOT NULL,
+            translation TEXT,
+            pronunciation TEXT,
+            added_at REAL,
+            next_review REAL,
+            interval REAL,
+            ease_factor REAL,
+            review_count INTEGER,
+            position INTEGER,
+            extra TEXT,
+            PRIMARY KEY (user_id, sentence, lang),
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_srs_items_due ON srs_items(user_id, next_review);
     """)
-    conn.close()
+    with conn:
+        # srs_items tables created before deck order and extra fields were kept
+        srs_columns = {row["name"] for row in conn.execute("PRAGMA table_info(srs_items)")}
+        for column, decl in (("position", "INTEGER"), ("extra", "TEXT")):
+            if column not in srs_columns:
+                conn.execute(f"ALTER TABLE srs_items ADD COLUMN {column} {decl}")
+        _migrate_srs_deck_blobs(conn)
+
+
+SRS_ITEM_FIELDS = (
+    ("sentence", "sentence"),
+    ("lang", "lang"),
+    ("translation", "translation"),
+    ("pronunciation", "pronunciation"),
+    ("addedAt", "added_at"),
+    ("nextReview", "next_review"),
+    ("interval", "interval"),
+    ("easeFactor", "ease_factor"),
+    ("reviewCount", "review_count"),
+)
+_SRS_ITEM_KEYS = frozenset(key for key, _ in SRS_ITEM_FIELDS)
+# A merged (duplicate) item keeps its original position in the deck
+UPSERT_SRS_ITEM_SQL = (
+    "INSERT INTO srs_items (user_id, position, " + ", ".join(col for _, col in SRS_ITEM_FIELDS) + ", extra) "
+    "VALUES (?, ?" + ", ?" * len(SRS_ITEM_FIELDS) + ", ?) "
+    "ON CONFLICT(user_id, sentence, lang) DO UPDATE SET "
+    + ", ".join(f"{col} = COALESCE(excluded.{col}, {col})" for col in (*(c for _, c in SRS_ITEM_FIELDS[2:]), "extra"))
+)
+
+
+def _fits_srs_column(value: Any) -> bool:
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
+
+
+def srs_item_row(user_id: int, item: dict, position: int) -> tuple:
+    """Map a client-side deck item (camelCase keys) to an srs_items row at *position* in the deck.
+
+    Keys without a column, and values a column can't hold as-is (null,
+    booleans, nested objects from a hand-edited deck), are kept as JSON in
+    the extra column so the item reads back the way it was written.
+    """
+    values = (item.get(key) for key, _ in SRS_ITEM_FIELDS[2:])
+    extra = {k: v for k, v in item.items() if k not in _SRS_ITEM_KEYS or not _fits_srs_column(v)}
+    return (user_id, position, str(item.get("sentence") or ""), str(item.get("lang") or ""),
+            *(v if _fits_srs_column(v) else None for v in values),
+            orjson.dumps(extra).decode() if extra else None)
+
+
+def _migrate_srs_deck_blobs(conn: sqlite3.Connection) -> None:
+    """Move legacy user_data 'srs_deck' JSON blobs into srs_items rows."""
+    rows = conn.execute("SELECT user_id, data_json FROM user_data WHERE data_key = 'srs_deck'").fetchall()
+    for row in rows:
+        try:
+            deck = orjson.loads(row["data_json"])
+        except orjson.JSONDecodeError:
+            deck = []
+        if isinstance(deck, list):
+            items = [item for item in deck if isinstance(item, dict)]
+            conn.executemany(UPSERT_SRS_ITEM_SQL,
+                             [srs_item_row(row["user_id"], item, i) for i, item in enumerate(items)])
+    if rows:
+        conn.execute("DELETE FROM user_data WHERE data_key = 'srs_deck'")
 
 
 def hash_password(password: str) -> str:
@@ -123,14 +244,24 @@ def verify_password(password: str, stored: str) -> bool:
         return False
 
 
-def create_session(user_id: int) -> str:
+INSERT_SESSION_SQL = "INSERT INTO sessions (user_id, token, created_at, expires_at) VALUES (?, ?, ?, ?)"
+
+
+def create_session(user_id: int, conn: Optional[sqlite3.Connection] = None) -> str:
+    """Create a session token for *user_id*.
+
+    Pass *conn* to insert inside the caller's open transaction; otherwise the
+    insert is committed on its own.
+    """
     token = secrets.token_hex(32)
     now = time.time()
+    params = (user_id, token, now, now + SESSION_TTL)
+    if conn is not None:
+        conn.execute(INSERT_SESSION_SQL, params)
+        return token
     conn = get_db()
-    conn.execute("INSERT INTO sessions (user_id, token, created_at, expires_at) VALUES (?, ?, ?, ?)",
-                 (user_id, token, now, now + SESSION_TTL))
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(INSERT_SESSION_SQL, params)
     return token
 
 
@@ -142,7 +273,6 @@ def get_user_from_token(token: str) -> Optional[dict]:
         "SELECT s.user_id, u.username FROM sessions s JOIN users u ON s.user_id = u.id WHERE s.token = ? AND s.expires_at > ?",
         (token, time.time())
     ).fetchone()
-    conn.close()
     if row:
         return {"id": row["user_id"], "username": row["username"]}
     return None
@@ -151,11 +281,9 @@ def get_user_from_token(token: str) -> Optional[dict]:
 def cleanup_expired_sessions() -> int:
     """Delete expired sessions from the database. Returns count of deleted rows."""
     conn = get_db()
-    cursor = conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),))
-    deleted = cursor.rowcount
-    conn.commit()
-    conn.close()
-    return deleted
+    with conn:
+        cursor = conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),))
+    return cursor.rowcount
 
 
 def extract_bearer_token(authorization: Optional[str]) -> Optional[str]:
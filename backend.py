@@ -1,6 +1,5 @@
 """SentSay — Sentence-based language learning app. Entry point."""
 import asyncio
-import json
 import os
 from pathlib import Path
 
@@ -14,12 +13,14 @@ from fastapi.staticfiles import StaticFiles
 
 from cache import (load_cache, save_cache, is_cache_dirty, load_grammar_patterns,
                    save_grammar_patterns, is_grammar_dirty, load_word_cache,
-                   save_word_cache, _word_cache_dirty)
-from auth import init_user_db, cleanup_expired_sessions, rate_limit_remaining, get_rate_limit_key, RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW
-from llm import check_ollama_connectivity
+                   save_word_cache, _word_cache_dirty, wait_file_writes)
+from auth import init_user_db, close_db, cleanup_expired_sessions, rate_limit_remaining, get_rate_limit_key, RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW
+from llm import check_ollama_connectivity, get_ollama_client, close_ollama_client, warm_ollama_models, get_jieba
 from routes import router
+from learn_routes import backfill_cached_difficulty
 from stats_routes import router as stats_router
-from surprise import load_surprise_bank, fill_surprise_bank_task, refill_surprise_bank_task, get_surprise_bank
+from surprise import (load_surprise_bank, surprise_bank_producer,
+                      close_precompute_client, surprise_bank_flusher, flush_surprise_bank)
 
 app = FastAPI(
     title="SentSay API",
@@ -116,12 +117,16 @@ async def log_requests(request, call_next):
 @app.on_event("startup")
 async def _startup_cache():
     load_cache()
+    filled = backfill_cached_difficulty()
+    if filled:
+        logger.info("Backfilled difficulty on cached results", extra={"component": "cache", "count": filled})
     load_grammar_patterns()
     load_word_cache()
 
 
 @app.on_event("shutdown")
 async def _shutdown_cache():
+    await wait_file_writes()
     if is_cache_dirty():
         save_cache()
         logger.info("Cache saved on shutdown", extra={"component": "cache"})
@@ -133,16 +138,42 @@ async def _shutdown_cache():
         logger.info("Word cache saved on shutdown", extra={"component": "cache"})
 
 
+@app.on_event("startup")
+async def _startup_ollama_client():
+    app.state.http_client = get_ollama_client()
+    # Load models in the background; startup must not wait on (or fail with) Ollama.
+    asyncio.create_task(warm_ollama_models())
+
+
+@app.on_event("shutdown")
+async def _shutdown_ollama_client():
+    await close_ollama_client()
+
+
+@app.on_event("shutdown")
+async def _shutdown_precompute_client():
+    await close_precompute_client()
+
+
+@app.on_event("shutdown")
+async def _shutdown_surprise_bank():
+    flush_surprise_bank()
+
+
+@app.on_event("startup")
+async def _startup_jieba():
+    # Load jieba and the Taiwan word list off the event loop so the first
+    # Chinese request doesn't pay for it.
+    asyncio.create_task(asyncio.to_thread(get_jieba))
+
+
 @app.on_event("startup")
 async def _startup_surprise():
-    load_surprise_bank()
+    await load_surprise_bank()
     ollama_ok = await check_ollama_connectivity()
     if ollama_ok:
-        bank = get_surprise_bank()
-        if not bank or sum(len(v) for v in bank.values()) < 5:
-            logger.info("Surprise bank low/empty, starting background fill", extra={"component": "surprise-bank"})
-            asyncio.create_task(fill_surprise_bank_task())
-        asyncio.create_task(refill_surprise_bank_task())
+        asyncio.create_task(surprise_bank_producer())
+        asyncio.create_task(surprise_bank_flusher())
     else:
         logger.warning("Ollama not available, skipping surprise bank fill", extra={"component": "surprise-bank"})
 
@@ -152,6 +183,11 @@ async def _startup_user_db():
     init_user_db()
 
 
+@app.on_event("shutdown")
+async def _shutdown_user_db():
+    close_db()
+
+
 SESSION_CLEANUP_INTERVAL = 3600  # 1 hour
 
 
@@ -4,18 +4,83 @@ Also tracks low-quality translations reported via feedback so we can:
 - evict them from the cache immediately
 - avoid re-caching the exact same sentence+translation+language combo later
 """
-import json
+import os
 import time
+import tempfile
+import contextlib
+import asyncio
 import hashlib
 import re as _re
-from typing import Optional
+from typing import Optional, Dict, Callable, Awaitable, Any
 from pathlib import Path
 from collections import OrderedDict
 
+import orjson
+
 from log import get_logger
 
 logger = get_logger("sentsei.cache")
 
+
+# --- Persistence ---
+_file_writes: Dict[Path, asyncio.Task] = {}  # latest pending background write per file
+
+
+def _write_file_atomic(path: Path, data: bytes):
+    # A unique temp file per write, so a shutdown save can't collide with a
+    # background write of the same file still running in its thread
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            os.fchmod(f.fileno(), 0o644)
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+async def _write_file_after(prev: Optional[asyncio.Task], path: Path, data: bytes, component: str,
+                            on_error: Optional[Callable[[], None]]):
+    if prev is not None:
+        await asyncio.wait((prev,))  # keep writes to one file in call order
+    try:
+        await asyncio.to_thread(_write_file_atomic, path, data)
+    except Exception:
+        logger.exception("Failed to write file", extra={"component": component, "detail": path.name})
+        if on_error is not None:
+            on_error()
+
+
+def _write_file(path: Path, data: bytes, component: str, background: bool = False,
+                on_error: Optional[Callable[[], None]] = None):
+    """Atomically replace *path* with *data*.
+
+    With *background* (and a running event loop) the disk write happens in a
+    worker thread so request handlers don't block on it; callers encode
+    *data* first, on the loop, so the snapshot can't change mid-write.
+    A failed background write can't raise to the caller, so it calls
+    *on_error* instead (e.g. to mark the data dirty again).
+    """
+    if not background:
+        _write_file_atomic(path, data)
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        _write_file_atomic(path, data)
+        return
+    task = asyncio.create_task(_write_file_after(_file_writes.get(path), path, data, component, on_error))
+    _file_writes[path] = task
+    task.add_done_callback(lambda t: _file_writes.pop(path) if _file_writes.get(path) is t else None)
+
+
+async def wait_file_writes():
+    """Wait for pending background writes; call before a final synchronous save so it lands last."""
+    while pending := [t for t in _file_writes.values() if not t.done()]:
+        await asyncio.wait(pending)
+
 # --- Translation Cache ---
 CACHE_MAX = 500
 CACHE_TTL = 3600 * 24  # 24h
@@ -23,6 +88,12 @@ CACHE_FILE = Path(__file__).parent / "translation_cache.json"
 CACHE_SAVE_INTERVAL = 60
 
 _translation_cache: OrderedDict = OrderedDict()
+# key -> (result, encoded frame); the frame is reused only while `result` is
+# still the exact object cached under that key.
+_translation_frames: Dict[str, tuple] = {}
+# key -> LLM-cache key of the completion the result was parsed from, so
+# flagging a translation also drops the raw text it came from
+_translation_llm_keys: Dict[str, str] = {}
 _cache_dirty = False
 _cache_last_save = 0.0
 
@@ -46,7 +117,7 @@ def load_bad_translations():
         return
     if BAD_TRANSLATIONS_FILE.exists():
         try:
-            data = json.loads(BAD_TRANSLATIONS_FILE.read_text())
+            data = orjson.loads(BAD_TRANSLATIONS_FILE.read_bytes())
             if isinstance(data, dict):
                 _bad_translations = data
         except Exception:
@@ -54,10 +125,10 @@ def load_bad_translations():
             _bad_translations = {}
 
 
-def save_bad_translations():
-    global _bad_translations
+def save_bad_translations(background: bool = False):
     try:
-        BAD_TRANSLATIONS_FILE.write_text(json.dumps(_bad_translations, ensure_ascii=False, indent=2))
+        _write_file(BAD_TRANSLATIONS_FILE, orjson.dumps(_bad_translations, option=orjson.OPT_INDENT_2),
+                    "cache", background)
     except Exception:
         logger.exception("Failed to save bad translations file", extra={"component": "cache"})
 
@@ -66,7 +137,8 @@ def mark_translation_bad(sentence: str, translation: str, target_language: str):
     """Mark a translation as low quality.
 
     - Records it in bad_translations.json
-    - Evicts any matching entries from the in-memory translation cache
+    - Evicts any matching entries from the in-memory translation cache,
+      along with the LLM completions they were parsed from
     """
     if not sentence or not translation or not target_language:
         return
@@ -77,7 +149,7 @@ def mark_translation_bad(sentence: str, translation: str, target_language: str):
     entry["count"] = int(entry.get("count", 0)) + 1
     entry["last_ts"] = time.time()
     _bad_translations[key] = entry
-    save_bad_translations()
+    save_bad_translations(background=True)
 
     # Evict any cached results that match this sentence+translation+lang combo
     to_delete = []
@@ -94,6 +166,10 @@ def mark_translation_bad(sentence: str, translation: str, target_language: str):
 
     for ck in to_delete:
         _translation_cache.pop(ck, None)
+        _translation_frames.pop(ck, None)
+        llm_key = _translation_llm_keys.pop(ck, None)
+        if llm_key is not None:
+            _llm_cache.pop(llm_key, None)
         logger.info(
             "Evicted low-quality translation from cache",
             extra={
@@ -118,11 +194,30 @@ def cache_get(key: str):
     ts, result = entry
     if time.time() - ts > CACHE_TTL:
         _translation_cache.pop(key, None)
+        _translation_frames.pop(key, None)
+        _translation_llm_keys.pop(key, None)
         return None
     _translation_cache.move_to_end(key)
     return result
 
 
+def cache_get_frame(key: str, encode: Callable[[dict], bytes]) -> Optional[bytes]:
+    """Like cache_get, but return ``encode(result)``, memoized per cached entry.
+
+    Large results are re-served far more often than they change, so hits
+    skip re-serializing the same dict every time.
+    """
+    result = cache_get(key)
+    if result is None:
+        return None
+    memo = _translation_frames.get(key)
+    if memo is not None and memo[0] is result:
+        return memo[1]
+    frame = encode(result)
+    _translation_frames[key] = (result, frame)
+    return frame
+
+
 def cache_scan_prefix(sentence: str, target_lang: str):
     """Find any cached result for a sentence+language combo, ignoring gender/formality.
 
@@ -137,11 +232,13 @@ def cache_scan_prefix(sentence: str, target_lang: str):
     return None
 
 
-def cache_put(key: str, result: dict):
+def cache_put(key: str, result: dict, llm_key: Optional[str] = None):
     """Insert a translation into the cache.
 
-    If the exact sentence+translation+language combo has been flagged as
-    low quality via feedback, we skip caching it again.
+    *llm_key* is the LLM-cache key of the completion *result* was parsed
+    from. If the exact sentence+translation+language combo has been flagged
+    as low quality via feedback, we skip caching it again and drop that
+    completion too, so the next request regenerates it.
     """
     global _cache_dirty
 
@@ -161,14 +258,22 @@ def cache_put(key: str, result: dict):
                         "target_language": target_language,
                     },
                 )
+                if llm_key is not None:
+                    _llm_cache.pop(llm_key, None)
                 return
     except Exception:
         # Never let cache failures break the main code path
         logger.exception("Error checking bad translation list", extra={"component": "cache"})
 
     _translation_cache[key] = (time.time(), result)
+    if llm_key is not None:
+        _translation_llm_keys[key] = llm_key
+    else:
+        _translation_llm_keys.pop(key, None)
     if len(_translation_cache) > CACHE_MAX:
-        _translation_cache.popitem(last=False)
+        evicted, _ = _translation_cache.popitem(last=False)
+        _translation_frames.pop(evicted, None)
+        _translation_llm_keys.pop(evicted, None)
     _cache_dirty = True
     _maybe_save_cache()
 
@@ -177,7 +282,7 @@ def load_cache():
     global _cache_last_save
     if CACHE_FILE.exists():
         try:
-            data = json.loads(CACHE_FILE.read_text())
+            data = orjson.loads(CACHE_FILE.read_bytes())
             now = time.time()
             loaded = 0
             for key, (ts, result) in data.items():
@@ -192,19 +297,24 @@ def load_cache():
     _cache_last_save = time.time()
 
 
-def save_cache():
+def save_cache(background: bool = False):
     global _cache_dirty, _cache_last_save
     try:
-        CACHE_FILE.write_text(json.dumps(dict(_translation_cache), ensure_ascii=False))
+        _write_file(CACHE_FILE, orjson.dumps(_translation_cache), "cache", background, _mark_cache_dirty)
         _cache_dirty = False
         _cache_last_save = time.time()
     except Exception:
         logger.exception("Failed to save cache", extra={"component": "cache"})
 
 
+def _mark_cache_dirty():
+    global _cache_dirty
+    _cache_dirty = True
+
+
 def _maybe_save_cache():
     if _cache_dirty and (time.time() - _cache_last_save) >= CACHE_SAVE_INTERVAL:
-        save_cache()
+        save_cache(background=True)
 
 
 # --- Word Detail Cache ---
@@ -247,7 +357,7 @@ def load_word_cache():
     global _word_cache_last_save
     if WORD_CACHE_FILE.exists():
         try:
-            data = json.loads(WORD_CACHE_FILE.read_text())
+            data = orjson.loads(WORD_CACHE_FILE.read_bytes())
             now = time.time()
             loaded = 0
             for key, (ts, result) in data.items():
@@ -262,25 +372,169 @@ def load_word_cache():
     _word_cache_last_save = time.time()
 
 
-def save_word_cache():
+def save_word_cache(background: bool = False):
     global _word_cache_dirty, _word_cache_last_save
     try:
-        WORD_CACHE_FILE.write_text(json.dumps(dict(_word_cache), ensure_ascii=False))
+        _write_file(WORD_CACHE_FILE, orjson.dumps(_word_cache), "cache", background, _mark_word_cache_dirty)
         _word_cache_dirty = False
         _word_cache_last_save = time.time()
     except Exception:
         logger.exception("Failed to save word cache", extra={"component": "cache"})
 
 
+def _mark_word_cache_dirty():
+    global _word_cache_dirty
+    _word_cache_dirty = True
+
+
 def _maybe_save_word_cache():
     if _word_cache_dirty and (time.time() - _word_cache_last_save) >= CACHE_SAVE_INTERVAL:
-        save_word_cache()
+        save_word_cache(background=True)
 
 
 def word_cache_stats() -> dict:
     return {"entries": len(_word_cache), "max": WORD_CACHE_MAX, "ttl_hours": WORD_CACHE_TTL / 3600}
 
 
+# --- LLM Response Cache ---
+# Exact-match cache of raw Ollama completions keyed on the full request.
+# Only low-temperature (near-deterministic) calls are cached.
+LLM_CACHE_MAX = 1000
+LLM_CACHE_TTL = 3600 * 24  # 24h
+LLM_CACHE_MAX_TEMPERATURE = 0.5
+
+_llm_cache: OrderedDict = OrderedDict()
+
+
+def llm_cache_key(model: str, temperature: float, num_predict: int, messages: list) -> str:
+    # In-memory only, so the key format is free to change between releases
+    h = hashlib.blake2b(f"{model}|{temperature}|{num_predict}|".encode(), digest_size=16)
+    h.update(orjson.dumps(messages, option=orjson.OPT_SORT_KEYS))
+    return h.hexdigest()
+
+
+def llm_cache_get(key: str) -> Optional[str]:
+    entry = _llm_cache.get(key)
+    if entry is None:
+        return None
+    ts, text = entry
+    if time.time() - ts > LLM_CACHE_TTL:
+        _llm_cache.pop(key, None)
+        return None
+    _llm_cache.move_to_end(key)
+    return text
+
+
+def llm_cache_put(key: str, text: str):
+    _llm_cache[key] = (time.time(), text)
+    if len(_llm_cache) > LLM_CACHE_MAX:
+        _llm_cache.popitem(last=False)
+
+
+def llm_cache_stats() -> dict:
+    return {"entries": len(_llm_cache), "max": LLM_CACHE_MAX, "ttl_hours": LLM_CACHE_TTL / 3600}
+
+
+# --- Quiz Cache ---
+# Parsed quiz translations and grading verdicts. Both prompts run at
+# temperature <= 0.2, so reusing a verdict for the same inputs is safe.
+QUIZ_CACHE_MAX = 500
+QUIZ_CACHE_TTL = 3600 * 24  # 24h
+
+_quiz_cache: OrderedDict = OrderedDict()
+
+
+def quiz_cache_key(*parts: str) -> str:
+    raw = "|".join(parts)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def quiz_cache_get(key: str):
+    entry = _quiz_cache.get(key)
+    if entry is None:
+        return None
+    ts, result = entry
+    if time.time() - ts > QUIZ_CACHE_TTL:
+        _quiz_cache.pop(key, None)
+        return None
+    _quiz_cache.move_to_end(key)
+    return result
+
+
+def quiz_cache_put(key: str, result: dict):
+    _quiz_cache[key] = (time.time(), result)
+    if len(_quiz_cache) > QUIZ_CACHE_MAX:
+        _quiz_cache.popitem(last=False)
+
+
+def quiz_cache_stats() -> dict:
+    return {"entries": len(_quiz_cache), "max": QUIZ_CACHE_MAX, "ttl_hours": QUIZ_CACHE_TTL / 3600}
+
+
+# --- In-flight Request Coalescing ---
+# Cache entries only appear once an LLM call finishes, so identical requests
+# arriving meanwhile would each start their own call. Instead the first caller
+# registers a future under the cache key and the others await it.
+_in_flight: Dict[str, asyncio.Future] = {}
+
+
+def in_flight_get(key: str) -> Optional[asyncio.Future]:
+    return _in_flight.get(key)
+
+
+def in_flight_begin(key: str) -> asyncio.Future:
+    fut = asyncio.get_running_loop().create_future()
+    _in_flight[key] = fut
+    return fut
+
+
+async def in_flight_wait(key: str) -> Optional[asyncio.Future]:
+    """Wait for the call in flight for *key* and return its settled future, or None if there is none.
+
+    A flight whose leader was cancelled (its client went away) is not a
+    result: the wait moves on to the next flight, and returns None once the
+    caller should start the call itself.
+    """
+    while (fut := _in_flight.get(key)) is not None:
+        await asyncio.wait((fut,))
+        if not fut.cancelled():
+            return fut
+    return None
+
+
+def in_flight_end(key: str, fut: asyncio.Future, result: Any = None, error: Optional[BaseException] = None):
+    if _in_flight.get(key) is fut:
+        del _in_flight[key]
+    if fut.done():
+        return
+    if error is None:
+        fut.set_result(result)
+    elif isinstance(error, asyncio.CancelledError):
+        fut.cancel()
+    else:
+        fut.set_exception(error)
+        fut.exception()  # mark retrieved; waiters re-raise it themselves
+
+
+async def single_flight(key: str, factory: Callable[[], Awaitable[Any]]):
+    """Await factory() once per key; concurrent callers share its result.
+
+    If the caller running factory() is cancelled, a waiting caller takes over
+    and runs it instead of failing too.
+    """
+    fut = await in_flight_wait(key)
+    if fut is not None:
+        return fut.result()
+    fut = in_flight_begin(key)
+    try:
+        result = await factory()
+    except BaseException as e:
+        in_flight_end(key, fut, error=e)
+        raise
+    in_flight_end(key, fut, result)
+    return result
+
+
 def is_cache_dirty():
     return _cache_dirty
 
@@ -289,6 +543,7 @@ def is_cache_dirty():
 GRAMMAR_PATTERNS_FILE = Path(__file__).parent / "grammar_patterns.json"
 _grammar_patterns: dict = {}
 _grammar_dirty = False
+_grammar_version = 0  # bumped on every change; used for /api/grammar-patterns ETags
 
 
 def _gp_id(name: str, lang: str) -> str:
@@ -297,24 +552,31 @@ def _gp_id(name: str, lang: str) -> str:
 
 
 def load_grammar_patterns():
-    global _grammar_patterns
+    global _grammar_patterns, _grammar_version
+    _grammar_version += 1
     if GRAMMAR_PATTERNS_FILE.exists():
         try:
-            _grammar_patterns = json.loads(GRAMMAR_PATTERNS_FILE.read_text())
+            _grammar_patterns = orjson.loads(GRAMMAR_PATTERNS_FILE.read_bytes())
         except Exception:
             logger.exception("Failed to load grammar patterns", extra={"component": "grammar"})
             _grammar_patterns = {}
 
 
-def save_grammar_patterns():
+def save_grammar_patterns(background: bool = False):
     global _grammar_dirty
     try:
-        GRAMMAR_PATTERNS_FILE.write_text(json.dumps(_grammar_patterns, ensure_ascii=False, indent=2))
+        _write_file(GRAMMAR_PATTERNS_FILE, orjson.dumps(_grammar_patterns, option=orjson.OPT_INDENT_2),
+                    "grammar", background, _mark_grammar_dirty)
         _grammar_dirty = False
     except Exception:
         logger.exception("Failed to save grammar patterns", extra={"component": "grammar"})
 
 
+def _mark_grammar_dirty():
+    global _grammar_dirty
+    _grammar_dirty = True
+
+
 def is_grammar_dirty():
     return _grammar_dirty
 
@@ -323,8 +585,25 @@ def get_grammar_patterns():
     return _grammar_patterns
 
 
+def get_grammar_version() -> int:
+    return _grammar_version
+
+
+_grammar_sorted: list = []
+_grammar_sorted_version = -1
+
+
+def get_grammar_patterns_sorted_by_count() -> list:
+    """Patterns ordered by descending count, re-sorted only after a change."""
+    global _grammar_sorted, _grammar_sorted_version
+    if _grammar_sorted_version != _grammar_version:
+        _grammar_sorted = sorted(_grammar_patterns.values(), key=lambda p: -p.get("count", 0))
+        _grammar_sorted_version = _grammar_version
+    return _grammar_sorted
+
+
 def extract_and_store_grammar_patterns(result: dict, lang_code: str, source_sentence: str):
-    global _grammar_dirty
+    global _grammar_dirty, _grammar_version
     grammar_notes = result.get("grammar_notes", []) or []
     if not grammar_notes:
         return
@@ -378,20 +657,34 @@ def extract_and_store_grammar_patterns(result: dict, lang_code: str, source_sent
             _grammar_dirty = True
 
     if _grammar_dirty:
-        save_grammar_patterns()
+        _grammar_version += 1
+        save_grammar_patterns(background=True)
 
 
 # --- Quiz Answers ---
 QUIZ_ANSWER_TTL = 3600
-_quiz_answers: dict = {}
+QUIZ_ANSWERS_MAX = 10_000  # hard cap; the oldest quizzes are dropped first
+# Insertion-ordered: quiz ids are random and stamped with created_at on insert,
+# so expired entries always form a prefix and cleanup stops at the first live one.
+_quiz_answers: OrderedDict = OrderedDict()
 
 
 def get_quiz_answers():
     return _quiz_answers
 
 
+def store_quiz_answer(quiz_id: str, payload: dict):
+    """Remember a quiz's answer for /api/quiz-check, expiring and capping old entries."""
+    cleanup_quiz_answers()
+    _quiz_answers[quiz_id] = payload
+    while len(_quiz_answers) > QUIZ_ANSWERS_MAX:
+        _quiz_answers.popitem(last=False)
+
+
 def cleanup_quiz_answers():
     cutoff = time.time() - QUIZ_ANSWER_TTL
-    stale_ids = [qid for qid, payload in _quiz_answers.items() if payload.get("created_at", 0) < cutoff]
-    for qid in stale_ids:
-        _quiz_answers.pop(qid, None)
+    while _quiz_answers:
+        qid = next(iter(_quiz_answers))
+        if _quiz_answers[qid].get("created_at", 0) >= cutoff:
+            break
+        _quiz_answers.popitem(last=False)
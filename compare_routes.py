@@ -1,13 +1,17 @@
 """Compare endpoint for Sentsei."""
-import json
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, Request
 
 from models import SUPPORTED_LANGUAGES, SentenceRequest, CompareRequest
-from auth import rate_limit_check, rate_limit_cleanup, get_rate_limit_key, require_password
+from auth import rate_limit_check, get_rate_limit_key, require_password
 from learn_routes import _learn_sentence_impl, _detect_input_language, MAX_INPUT_LEN
 
 router = APIRouter()
 
+# Compare targets every language except the one the input is written in
+_COMPARE_TARGETS_ZH = tuple(code for code in SUPPORTED_LANGUAGES if code != "zh")
+_COMPARE_TARGETS_EN = tuple(code for code in SUPPORTED_LANGUAGES if code != "en")
+
 
 @router.post("/api/compare", tags=["Learning"], summary="Compare translation across all languages")
 async def compare_sentence(
@@ -17,7 +21,6 @@ async def compare_sentence(
 ):
 
     rate_key = get_rate_limit_key(request)
-    rate_limit_cleanup()
     if not rate_limit_check(rate_key):
         raise HTTPException(429, "Too many requests. Please wait a minute.")
 
@@ -28,36 +31,39 @@ async def compare_sentence(
         raise HTTPException(400, f"Input too long (max {MAX_INPUT_LEN} characters)")
 
     input_is_chinese = _detect_input_language(req.sentence, req.input_language or "auto")
-    skip_langs = {"zh"} if input_is_chinese else {"en"}
-    target_langs = [code for code in SUPPORTED_LANGUAGES if code not in skip_langs]
+    target_langs = _COMPARE_TARGETS_ZH if input_is_chinese else _COMPARE_TARGETS_EN
 
-    results = []
-    for lang_code in target_langs:
-        single_req = SentenceRequest(
+    # The translations are independent LLM calls; run them concurrently (the
+    # Ollama slot semaphore still bounds how many hit the model at once).
+    outcomes = await asyncio.gather(*(
+        _learn_sentence_impl(request, SentenceRequest(
             sentence=req.sentence,
             target_language=lang_code,
             input_language=req.input_language,
             speaker_gender=req.speaker_gender,
             speaker_formality=req.speaker_formality,
-        )
-        try:
-            result = await _learn_sentence_impl(request, single_req)
-            if hasattr(result, 'body'):
-                result = json.loads(result.body)
-            results.append({
-                "language": lang_code,
-                "language_name": SUPPORTED_LANGUAGES[lang_code],
-                "translation": result.get("translation", ""),
-                "pronunciation": result.get("pronunciation", ""),
-                "formality": result.get("formality", ""),
-                "literal": result.get("literal", ""),
-                "difficulty": result.get("difficulty"),
-            })
-        except HTTPException as e:
-            if e.status_code == 429:
+        ))
+        for lang_code in target_langs
+    ), return_exceptions=True)
+
+    results = []
+    for lang_code, result in zip(target_langs, outcomes):
+        if isinstance(result, HTTPException):
+            if result.status_code == 429:
                 break
-            results.append({"language": lang_code, "language_name": SUPPORTED_LANGUAGES[lang_code], "error": str(e.detail)})
-        except Exception as e:
-            results.append({"language": lang_code, "language_name": SUPPORTED_LANGUAGES[lang_code], "error": str(e)})
+            results.append({"language": lang_code, "language_name": SUPPORTED_LANGUAGES[lang_code], "error": str(result.detail)})
+            continue
+        if isinstance(result, Exception):
+            results.append({"language": lang_code, "language_name": SUPPORTED_LANGUAGES[lang_code], "error": str(result)})
+            continue
+        results.append({
+            "language": lang_code,
+            "language_name": SUPPORTED_LANGUAGES[lang_code],
+            "translation": result.get("translation", ""),
+            "pronunciation": result.get("pronunciation", ""),
+            "formality": result.get("formality", ""),
+            "literal": result.get("literal", ""),
+            "difficulty": result.get("difficulty"),
+        })
 
     return {"sentence": req.sentence, "results": results}
@@ -1,8 +1,8 @@
 """Favorites/bookmarks API routes."""
-import json
 import time
 from typing import Optional, List
 
+import orjson
 from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from pydantic import BaseModel
 
@@ -31,10 +31,9 @@ async def get_favorites(authorization: Optional[str] = Header(default=None)):
         "SELECT data_json FROM user_data WHERE user_id = ? AND data_key = 'favorites'",
         (user["id"],)
     ).fetchone()
-    conn.close()
     if not row:
         return {"favorites": []}
-    return {"favorites": json.loads(row["data_json"])}
+    return {"favorites": orjson.loads(row["data_json"])}
 
 
 @router.post("/api/favorites", tags=["Favorites"], summary="Add a favorite")
@@ -57,19 +56,18 @@ async def add_favorite(
         "SELECT data_json FROM user_data WHERE user_id = ? AND data_key = 'favorites'",
         (user["id"],)
     ).fetchone()
-    favorites = json.loads(row["data_json"]) if row else []
+    favorites = orjson.loads(row["data_json"]) if row else []
 
     # Deduplicate by sentence+lang
     favorites = [f for f in favorites if not (f.get("sentence") == fav["sentence"] and f.get("lang") == fav["lang"])]
     favorites.insert(0, fav)
 
-    conn.execute(
-        "INSERT INTO user_data (user_id, data_key, data_json, updated_at) VALUES (?, 'favorites', ?, ?) "
-        "ON CONFLICT(user_id, data_key) DO UPDATE SET data_json = excluded.data_json, updated_at = excluded.updated_at",
-        (user["id"], json.dumps(favorites, ensure_ascii=False), time.time())
-    )
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(
+            "INSERT INTO user_data (user_id, data_key, data_json, updated_at) VALUES (?, 'favorites', ?, ?) "
+            "ON CONFLICT(user_id, data_key) DO UPDATE SET data_json = excluded.data_json, updated_at = excluded.updated_at",
+            (user["id"], orjson.dumps(favorites).decode(), time.time())
+        )
     return {"ok": True, "count": len(favorites)}
 
 
@@ -91,19 +89,17 @@ async def remove_favorite(
         (user["id"],)
     ).fetchone()
     if not row:
-        conn.close()
         return {"ok": True, "count": 0}
 
-    favorites = json.loads(row["data_json"])
+    favorites = orjson.loads(row["data_json"])
     favorites = [f for f in favorites if not (f.get("sentence") == sentence and f.get("lang") == lang)]
 
-    conn.execute(
-        "INSERT INTO user_data (user_id, data_key, data_json, updated_at) VALUES (?, 'favorites', ?, ?) "
-        "ON CONFLICT(user_id, data_key) DO UPDATE SET data_json = excluded.data_json, updated_at = excluded.updated_at",
-        (user["id"], json.dumps(favorites, ensure_ascii=False), time.time())
-    )
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(
+            "INSERT INTO user_data (user_id, data_key, data_json, updated_at) VALUES (?, 'favorites', ?, ?) "
+            "ON CONFLICT(user_id, data_key) DO UPDATE SET data_json = excluded.data_json, updated_at = excluded.updated_at",
+            (user["id"], orjson.dumps(favorites).decode(), time.time())
+        )
     return {"ok": True, "count": len(favorites)}
 
 
@@ -1,8 +1,11 @@
 """Feedback endpoints."""
-import json
+import os
+import asyncio
 from typing import Optional
 from pathlib import Path
 
+import orjson
+
 from fastapi import APIRouter, Depends, HTTPException, Header
 
 from models import FeedbackRequest
@@ -12,6 +15,74 @@ from cache import mark_translation_bad
 router = APIRouter()
 
 FEEDBACK_FILE = Path(__file__).parent / "feedback.jsonl"
+# Serializes appends (done in a worker thread) with listing and the delete endpoint's rewrite
+_feedback_lock = asyncio.Lock()
+FEEDBACK_READ_BLOCK = 64 * 1024  # bytes read per step when scanning the log backwards
+# (inode, bytes counted, entry count) from the last listing; the log is
+# append-only between deletes, which replace the file (new inode)
+_feedback_count = (0, 0, 0)
+
+
+def _append_feedback(line: bytes):
+    with open(FEEDBACK_FILE, "ab") as f:
+        f.write(line)
+
+
+def _count_feedback_lines(f, st: os.stat_result) -> int:
+    """Non-blank lines in the open log; only bytes appended since the last count are read."""
+    global _feedback_count
+    ino, counted, count = _feedback_count
+    if ino != st.st_ino or counted > st.st_size:
+        counted = count = 0
+    f.seek(counted)
+    count += sum(1 for line in f if line.strip())
+    _feedback_count = (st.st_ino, st.st_size, count)
+    return count
+
+
+def _tail_lines(f, size: int, n: int) -> list:
+    """The last *n* non-blank lines of the open log, oldest first, read backwards from EOF in blocks."""
+    pos, head, lines = size, b"", []
+    while pos > 0 and len(lines) < n:
+        step = min(FEEDBACK_READ_BLOCK, pos)
+        pos -= step
+        f.seek(pos)
+        parts = (f.read(step) + head).split(b"\n")
+        head = parts[0]  # may continue in the block before this one
+        lines[:0] = [p for p in parts[1:] if p.strip()]
+    if pos == 0 and head.strip():
+        lines.insert(0, head)
+    return lines[-n:] if n else []
+
+
+def _read_feedback_page(offset: int, limit: int) -> tuple:
+    """Return (entry count, newest-first page), reading only the lines the page needs."""
+    with open(FEEDBACK_FILE, "rb") as f:
+        st = os.fstat(f.fileno())
+        total = _count_feedback_lines(f, st)
+        lines = _tail_lines(f, st.st_size, offset + limit)
+    entries = []
+    for line in reversed(lines[:max(len(lines) - offset, 0)]):
+        try:
+            entries.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            pass
+    return total, entries
+
+
+def _delete_feedback_line(index: int) -> bool:
+    """Remove the *index*-th newest entry; rewrites via a temp file so a crash can't truncate the log."""
+    global _feedback_count
+    lines = [l for l in FEEDBACK_FILE.read_text().strip().splitlines() if l.strip()]
+    file_index = len(lines) - 1 - index
+    if file_index < 0 or file_index >= len(lines):
+        return False
+    lines.pop(file_index)
+    tmp = FEEDBACK_FILE.with_suffix(".jsonl.tmp")
+    tmp.write_text("\n".join(lines) + "\n" if lines else "")
+    os.replace(tmp, FEEDBACK_FILE)
+    _feedback_count = (0, 0, 0)  # the freed inode could be reused by a later rewrite
+    return True
 
 
 @router.post("/api/feedback", tags=["Feedback"], summary="Submit feedback")
@@ -58,33 +129,27 @@ async def submit_feedback(req: FeedbackRequest, _pw=Depends(require_password)):
         "target_language": req.target_language,
         "quality": "negative" if is_negative else "neutral",
     }
-    with open(FEEDBACK_FILE, "a") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    line = orjson.dumps(entry) + b"\n"
+    async with _feedback_lock:
+        await asyncio.to_thread(_append_feedback, line)
     return {"ok": True}
 
 
 @router.get("/api/feedback-list", tags=["Feedback"], summary="List all feedback (admin)")
 async def list_feedback(_pw=Depends(require_password), limit: int = 50, offset: int = 0):
-    entries = []
-    if FEEDBACK_FILE.exists():
-        for line in FEEDBACK_FILE.read_text().strip().splitlines():
-            if line.strip():
-                try:
-                    entries.append(json.loads(line))
-                except json.JSONDecodeError:
-                    pass
-    entries.reverse()
-    return {"total": len(entries), "entries": entries[offset:offset + limit]}
+    if not FEEDBACK_FILE.exists():
+        return {"total": 0, "entries": []}
+    async with _feedback_lock:
+        total, entries = await asyncio.to_thread(_read_feedback_page, max(offset, 0), max(limit, 0))
+    return {"total": total, "entries": entries}
 
 
 @router.delete("/api/feedback/{index}", tags=["Feedback"], summary="Delete feedback entry (admin)")
 async def delete_feedback(index: int, _pw=Depends(require_password)):
     if not FEEDBACK_FILE.exists():
         raise HTTPException(404, "No feedback file")
-    lines = [l for l in FEEDBACK_FILE.read_text().strip().splitlines() if l.strip()]
-    file_index = len(lines) - 1 - index
-    if file_index < 0 or file_index >= len(lines):
+    async with _feedback_lock:
+        deleted = await asyncio.to_thread(_delete_feedback_line, index)
+    if not deleted:
         raise HTTPException(404, "Index out of range")
-    lines.pop(file_index)
-    FEEDBACK_FILE.write_text("\n".join(lines) + "\n" if lines else "")
     return {"ok": True}
@@ -1,15 +1,17 @@
 """Learn-related API route handlers for Sentsei."""
 import os
-import json
 import re as _re
 import random
 import hashlib
 import time
 import asyncio
-from typing import Optional, List
+import functools
+from typing import Optional, List, NamedTuple
 from pathlib import Path
 from collections import defaultdict
 
+import orjson
+
 from log import get_logger
 
 logger = get_logger("sentsei.learn_routes")
@@ -23,24 +25,20 @@ from models import (
     SentenceRequest, BreakdownRequest, MultiSentenceRequest,
 )
 from cache import (
-    cache_key, cache_get, cache_put,
+    cache_key, cache_get, cache_put, _translation_cache, llm_cache_key,
     extract_and_store_grammar_patterns, get_grammar_patterns,
 )
 from auth import (
-    APP_PASSWORD, rate_limit_check, rate_limit_cleanup, get_rate_limit_key,
+    APP_PASSWORD, rate_limit_check, get_rate_limit_key,
     require_password,
 )
 from llm import (
     OLLAMA_URL, OLLAMA_MODEL, OLLAMA_MODEL_FAST, LANGUAGE_MODEL_OVERRIDES,
-    deterministic_pronunciation, deterministic_word_pronunciation,
+    deterministic_pronunciation, deterministic_word_pronunciation, apply_word_pronunciations,
     ensure_traditional_chinese, detect_sentence_difficulty,
-    cedict_lookup, parse_json_object, split_sentences,
-    ollama_chat, check_ollama_connectivity,
-    get_model_for_language,
-)
-
-from surprise import (
-    increment_user_request, decrement_user_request,
+    cedict_lookup, parse_json_object, split_sentences, jieba_words,
+    ollama_chat, check_ollama_connectivity, json_object_complete,
+    get_model_for_language, _HAN_RE,
 )
 
 router = APIRouter()
@@ -54,12 +52,13 @@ _injection_patterns = [
     "```", "---", "###", "SYSTEM:", "USER:", "ASSISTANT:",
 ]
 
+# One C-level scan instead of a Python loop of substring tests
+_INJECTION_RE = _re.compile("|".join(_re.escape(p.lower()) for p in _injection_patterns))
+
 
 def _check_injection(text: str):
-    lower_input = text.lower()
-    for pattern in _injection_patterns:
-        if pattern.lower() in lower_input:
-            raise HTTPException(400, "Invalid input")
+    if _INJECTION_RE.search(text.lower()):
+        raise HTTPException(400, "Invalid input")
 
 
 def _detect_input_language(sentence: str, input_lang: str = "auto"):
@@ -68,7 +67,180 @@ def _detect_input_language(sentence: str, input_lang: str = "auto"):
     elif input_lang == "en":
         return False
     else:
-        return any('\u4e00' <= c <= '\u9fff' for c in sentence)
+        return _HAN_RE.search(sentence) is not None
+
+
+class _LearnContext(NamedTuple):
+    lang_code: str
+    lang_name: str
+    input_is_chinese: bool
+    source_lang_short: str
+
+
+def _learn_context(req) -> _LearnContext:
+    """Language facts every learn-style handler derives from the request."""
+    lang_code = req.target_language
+    input_is_chinese = _detect_input_language(req.sentence, getattr(req, 'input_language', 'auto') or 'auto')
+    return _LearnContext(
+        lang_code, SUPPORTED_LANGUAGES[lang_code], input_is_chinese,
+        "繁體中文" if input_is_chinese else "English",
+    )
+
+
+_TW_PHRASES_FILE = Path(__file__).parent / "taiwanese_phrases.json"
+
+
+@functools.lru_cache(maxsize=1)
+def _load_tw_phrases() -> tuple:
+    """Taiwanese phrase list as (phrase, ((keyword_lower, keyword), ...)) pairs, read once."""
+    if not _TW_PHRASES_FILE.exists():
+        return ()
+    data = orjson.loads(_TW_PHRASES_FILE.read_bytes())
+    return tuple(
+        (p, tuple((kw.lower(), kw) for kw in p["keywords"]))
+        for p in data.get("phrases", [])
+    )
+
+
+# Common English loanwords that leak into zh translations, and their Taiwan Mandarin forms
+_EN_LEAK_RE = _re.compile(r'[a-zA-Z]{2,}')
+_EN_TO_ZH = {
+    'menu': '菜單', 'bill': '帳單', 'coffee': '咖啡', 'beer': '啤酒',
+    'ok': '好', 'sorry': '抱歉', 'thanks': '謝謝', 'thank': '謝',
+    'taxi': '計程車', 'bus': '公車', 'hotel': '旅館', 'wifi': '無線網路',
+    'email': '電子郵件', 'phone': '手機', 'app': '應用程式',
+    'restaurant': '餐廳', 'bar': '酒吧', 'shop': '商店',
+}
+
+
+# Cleanup of target-language text leaking into English explanations
+_CJK_KANA_HANGUL_RUN_RE = _re.compile(r'[\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af]+')
+_HAN_RUN_RE = _re.compile(r'[\u4e00-\u9fff]+')
+_WS_RE = _re.compile(r'\s+')
+_LEADING_PAREN_RE = _re.compile(r'^\(?\s*')
+_TRAILING_PAREN_RE = _re.compile(r'\s*\)?\s*$')
+
+
+# Japanese pronouns whose gender/formality implications get called out in the notes
+_JA_GENDER_MARKERS = (
+    ("私", "watashi", "neutral/formal, used by all genders"),
+    ("僕", "boku", "masculine, casual — used by boys/men"),
+    ("俺", "ore", "masculine, very casual/rough — used by men"),
+    ("あたし", "atashi", "feminine, casual — used by women/girls"),
+    ("わたくし", "watakushi", "very formal, gender-neutral"),
+)
+
+# Spaces and sentence punctuation ignored when checking breakdown words against the translation
+_BREAKDOWN_CHECK_STRIP_TABLE = str.maketrans("", "", " ，,。.！!？?")
+# Full-width sentence enders ignored when comparing the native expression to the translation
+_SENTENCE_END_STRIP_TABLE = str.maketrans("", "", "。！？")
+
+
+def _words_in_translation(breakdown: list, translation: str) -> list:
+    """Drop breakdown items whose word does not occur in the translation (hallucinated words).
+
+    Words are matched as contiguous substrings, so multi-character words must
+    appear in order; a plain `in` on the short cleaned translation runs in C.
+    """
+    clean_translation = translation.translate(_BREAKDOWN_CHECK_STRIP_TABLE)
+    return [item for item in breakdown if item.get("word", "").replace(" ", "") in clean_translation]
+
+
+def _han_ratio(s: str, length: Optional[int] = None) -> float:
+    """Fraction of Han characters in ``s`` (over ``length`` if given)."""
+    return len(_HAN_RE.findall(s)) / max(len(s) if length is None else length, 1)
+
+
+def _replace_en_leak(m: "_re.Match") -> str:
+    word = m.group(0)
+    return _EN_TO_ZH.get(word.lower(), word)
+
+
+_SCRIPT_EXAMPLES = {
+    "ko": "Korean script (한국어). Example: 커피 한 잔 주문하고 싶어요",
+    "ja": "Japanese script (日本語). Example: コーヒーを一杯注文したいです. IMPORTANT: For Japanese, always note gender implications of pronouns (e.g. 私/watashi vs 僕/boku vs 俺/ore) and formality levels in your notes.",
+    "he": "Hebrew script (עברית). Example: אני רוצה להזמין כוס קפה",
+    "el": "Greek script (Ελληνικά). Example: Θέλω να παραγγείλω έναν καφέ",
+    "zh": "Traditional Chinese (繁體中文). Example: 我想點一杯咖啡",
+    "en": "English. Example: I want to order a coffee",
+    "it": "Italian. Example: Vorrei ordinare un caffè",
+    "es": "Spanish. Example: Quiero pedir un café",
+}
+
+# Shorter hints for the /api/learn-fast prompt
+_SCRIPT_HINTS_SHORT = {
+    "ko": "Korean script (한국어)", "ja": "Japanese script (日本語)",
+    "he": "Hebrew script (עברית)", "el": "Greek script (Ελληνικά)",
+    "zh": "Traditional Chinese (繁體中文)", "en": "English",
+    "it": "Italian", "es": "Spanish",
+}
+
+LEARN_FAST_TMPL = """Translate into {lang_name} ({script_hint}): "{sentence}"
+Speaker: {gender}, {formality}. Explain in {source_lang_short}.
+JSON only: {{"translation":"...","pronunciation":"romanized","literal":"word-by-word in {source_lang_short}","formality":"{formality}","native_expression":"native way | pronunciation | explanation in {source_lang_short}, or null"}}"""
+
+_LEARN_FAST_SYSTEM = {
+    code: f"{name} translator. JSON only." + (" 繁體中文 Taiwan usage only." if code == "zh" else "")
+    for code, name in SUPPORTED_LANGUAGES.items()
+}
+
+_FORMALITY_HINTS = {
+    "ko": {"casual": "반말", "polite": "존댓말", "formal": "격식체"},
+    "ja": {"casual": "タメ口", "polite": "です/ます", "formal": "敬語"},
+    "zh": {"casual": "口語", "polite": "standard", "formal": "書面"},
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _learn_prompt_parts(lang_code: str, gender: str, formality: str, input_is_chinese: bool) -> tuple:
+    """Sentence-independent parts of the /api/learn prompt: (head, tail, system_msg).
+
+    The user prompt is head + sentence + tail.
+    """
+    lang_name = SUPPORTED_LANGUAGES[lang_code]
+    script_hint = _SCRIPT_EXAMPLES.get(lang_code, f"{lang_name} script")
+    source_lang_short = "繁體中文" if input_is_chinese else "English"
+
+    form_hint = ""
+    if lang_code in _FORMALITY_HINTS:
+        form_hint = f" ({_FORMALITY_HINTS[lang_code].get(formality, formality)})"
+
+    head = f'Translate into {lang_name} ({script_hint}): "'
+    tail = f""""
+Speaker: {gender}, {formality}{form_hint}. Explanations in {source_lang_short}.
+
+Return JSON only:
+{{"translation":"{lang_name} text","pronunciation":"romanized","literal":"word-by-word in {source_lang_short}",
+"breakdown":[{{"word":"..","pronunciation":"..","meaning":"in {source_lang_short}","difficulty":"easy|medium|hard","note":"grammar note in {source_lang_short} or null"}}],
+"grammar_notes":["1-3 key patterns in {source_lang_short}"],"cultural_note":"or null",
+"formality":"{formality}","alternative":"alt sentence | PRONUNCIATION or null",
+"native_expression":"native way | pronunciation | explanation in {source_lang_short}, or null if direct translation is already natural"}}
+
+Rules: translation MUST be in {lang_name} script. All meanings/notes in {source_lang_short} only. Break down only words from the translation.{' 繁體中文 Taiwan usage only, no 簡體.' if lang_code == 'zh' or input_is_chinese else ''}"""
+
+    if lang_code == "zh":
+        system_msg = f"台灣華語教師。繁體中文台灣用法，禁簡體/大陸用語。所有解釋用{source_lang_short}。JSON only."
+    elif input_is_chinese:
+        system_msg = f"{lang_name} teacher. Translate into {lang_name} only. Explanations in {source_lang_short}. 繁體中文 for Chinese text. JSON only."
+    else:
+        system_msg = f"{lang_name} teacher. Translate into {lang_name} only. Explanations in {source_lang_short}. JSON only."
+    return head, tail, system_msg
+
+
+def backfill_cached_difficulty() -> int:
+    """Store difficulty on cached learn results saved before it was part of the entry.
+
+    Run once after load_cache() so cache hits can be returned as-is.
+    """
+    filled = 0
+    for _ts, result in _translation_cache.values():
+        sentence = result.get("original_sentence")
+        if sentence and "translation" in result and result.get("difficulty") is None:
+            sd = detect_sentence_difficulty(sentence, result.get("breakdown", []))
+            result["sentence_difficulty"] = sd
+            result["difficulty"] = sd.get("level")
+            filled += 1
+    return filled
 
 
 @router.post("/api/learn", tags=["Learning"], summary="Translate and break down a sentence",
@@ -78,21 +250,19 @@ async def learn_sentence(
     req: SentenceRequest,
     _pw=Depends(require_password),
 ):
-    return await _learn_sentence_impl(request, req)
+    result = await _learn_sentence_impl(request, req)
+    return Response(orjson.dumps(result), media_type="application/json")
 
 
 async def _learn_sentence_impl(request: Request, req: SentenceRequest):
     """Core learn logic — no auth check, used by endpoint and internal callers."""
     rate_key = get_rate_limit_key(request)
-    rate_limit_cleanup()
     if not rate_limit_check(rate_key):
         raise HTTPException(429, "Too many requests. Please wait a minute.")
 
     if not req.sentence or not req.sentence.strip():
         raise HTTPException(400, "Sentence cannot be empty")
 
-    increment_user_request()
-
     if len(req.sentence) > MAX_INPUT_LEN:
         raise HTTPException(400, f"Input too long (max {MAX_INPUT_LEN} characters)")
     _check_injection(req.sentence)
@@ -105,65 +275,21 @@ async def _learn_sentence_impl(request: Request, req: SentenceRequest):
     ck = cache_key(req.sentence, req.target_language, gender, formality)
     cached = cache_get(ck)
     if cached:
-        decrement_user_request()
-        if "difficulty" not in cached or cached.get("difficulty") is None:
-            sd = detect_sentence_difficulty(req.sentence, cached.get("breakdown", []))
-            cached["sentence_difficulty"] = sd
-            cached["difficulty"] = sd.get("level")
         return cached
 
-    lang_name = SUPPORTED_LANGUAGES[req.target_language]
-    lang_code = req.target_language
-
-    script_examples = {
-        "ko": "Korean script (한국어). Example: 커피 한 잔 주문하고 싶어요",
-        "ja": "Japanese script (日本語). Example: コーヒーを一杯注文したいです. IMPORTANT: For Japanese, always note gender implications of pronouns (e.g. 私/watashi vs 僕/boku vs 俺/ore) and formality levels in your notes.",
-        "he": "Hebrew script (עברית). Example: אני רוצה להזמין כוס קפה",
-        "el": "Greek script (Ελληνικά). Example: Θέλω να παραγγείλω έναν καφέ",
-        "zh": "Traditional Chinese (繁體中文). Example: 我想點一杯咖啡",
-        "en": "English. Example: I want to order a coffee",
-        "it": "Italian. Example: Vorrei ordinare un caffè",
-        "es": "Spanish. Example: Quiero pedir un café",
-    }
-    script_hint = script_examples.get(lang_code, f"{lang_name} script")
-
-    input_is_chinese = _detect_input_language(req.sentence, getattr(req, 'input_language', 'auto') or 'auto')
-    source_lang = "Traditional Chinese (繁體中文, 台灣用法)" if input_is_chinese else "English"
-    source_lang_short = "繁體中文" if input_is_chinese else "English"
-
-    formality_hints = {
-        "ko": {"casual": "반말", "polite": "존댓말", "formal": "격식체"},
-        "ja": {"casual": "タメ口", "polite": "です/ます", "formal": "敬語"},
-        "zh": {"casual": "口語", "polite": "standard", "formal": "書面"},
-    }
-    form_hint = ""
-    if lang_code in formality_hints:
-        form_hint = f" ({formality_hints[lang_code].get(formality, formality)})"
-
-    prompt = f"""Translate into {lang_name} ({script_hint}): "{req.sentence}"
-Speaker: {gender}, {formality}{form_hint}. Explanations in {source_lang_short}.
-
-Return JSON only:
-{{"translation":"{lang_name} text","pronunciation":"romanized","literal":"word-by-word in {source_lang_short}",
-"breakdown":[{{"word":"..","pronunciation":"..","meaning":"in {source_lang_short}","difficulty":"easy|medium|hard","note":"grammar note in {source_lang_short} or null"}}],
-"grammar_notes":["1-3 key patterns in {source_lang_short}"],"cultural_note":"or null",
-"formality":"{formality}","alternative":"alt sentence | PRONUNCIATION or null",
-"native_expression":"native way | pronunciation | explanation in {source_lang_short}, or null if direct translation is already natural"}}
+    # The prompt parts derive the language names themselves (and are memoized on these args)
+    lang_code, _, input_is_chinese, _ = _learn_context(req)
 
-Rules: translation MUST be in {lang_name} script. All meanings/notes in {source_lang_short} only. Break down only words from the translation.{' 繁體中文 Taiwan usage only, no 簡體.' if lang_code == 'zh' or input_is_chinese else ''}"""
+    prompt_head, prompt_tail, system_msg = _learn_prompt_parts(lang_code, gender, formality, input_is_chinese)
+    prompt = f"{prompt_head}{req.sentence}{prompt_tail}"
 
     model = get_model_for_language(lang_code)
-
-    if lang_code == "zh":
-        system_msg = f"台灣華語教師。繁體中文台灣用法，禁簡體/大陸用語。所有解釋用{source_lang_short}。JSON only."
-    elif input_is_chinese:
-        system_msg = f"{lang_name} teacher. Translate into {lang_name} only. Explanations in {source_lang_short}. 繁體中文 for Chinese text. JSON only."
-    else:
-        system_msg = f"{lang_name} teacher. Translate into {lang_name} only. Explanations in {source_lang_short}. JSON only."
+    messages = [{"role": "system", "content": system_msg}, {"role": "user", "content": prompt}]
+    temperature, num_predict = 0.3, 1024
 
     text = await ollama_chat(
-        [{"role": "system", "content": system_msg}, {"role": "user", "content": prompt}],
-        model=model, temperature=0.3, num_predict=1024, timeout=60
+        messages, model=model, temperature=temperature, num_predict=num_predict, timeout=60,
+        early_stop=json_object_complete,
     )
 
     if text is None:
@@ -171,7 +297,6 @@ Rules: translation MUST be in {lang_name} script. All meanings/notes in {source_
         from cache import cache_scan_prefix
         fallback = cache_scan_prefix(req.sentence, req.target_language)
         if fallback:
-            decrement_user_request()
             fallback["from_cache"] = True
             fallback["ollama_offline"] = True
             return fallback
@@ -186,7 +311,7 @@ Rules: translation MUST be in {lang_name} script. All meanings/notes in {source_
     input_clean = req.sentence.strip().replace(" ", "")
     trans_clean = translation_text.strip().replace(" ", "")
     if lang_code not in ("zh", "en") and input_is_chinese and trans_clean and input_clean:
-        cjk_ratio = sum(1 for c in trans_clean if '\u4e00' <= c <= '\u9fff') / max(len(trans_clean), 1)
+        cjk_ratio = _han_ratio(trans_clean)
         if cjk_ratio > 0.5 and lang_code in ("ja",):
             if trans_clean == input_clean or input_clean in trans_clean:
                 result["_warning"] = "Translation may be echoing input. Model struggled with this input."
@@ -195,23 +320,10 @@ Rules: translation MUST be in {lang_name} script. All meanings/notes in {source_
 
     # Post-process: detect English words leaking into Chinese translations
     if lang_code == "zh" and translation_text:
-        english_words = _re.findall(r'[a-zA-Z]{2,}', translation_text)
-        if english_words:
-            en_to_zh = {
-                'menu': '菜單', 'bill': '帳單', 'coffee': '咖啡', 'beer': '啤酒',
-                'ok': '好', 'sorry': '抱歉', 'thanks': '謝謝', 'thank': '謝',
-                'taxi': '計程車', 'bus': '公車', 'hotel': '旅館', 'wifi': '無線網路',
-                'email': '電子郵件', 'phone': '手機', 'app': '應用程式',
-                'restaurant': '餐廳', 'bar': '酒吧', 'shop': '商店',
-            }
-            fixed = translation_text
-            for word in english_words:
-                replacement = en_to_zh.get(word.lower())
-                if replacement:
-                    fixed = fixed.replace(word, replacement)
-            if fixed != translation_text:
-                result["translation"] = fixed
-                translation_text = fixed
+        fixed = _EN_LEAK_RE.sub(_replace_en_leak, translation_text)
+        if fixed != translation_text:
+            result["translation"] = fixed
+            translation_text = fixed
 
     # Override pronunciation with deterministic libraries
     det_pron = deterministic_pronunciation(translation_text, lang_code)
@@ -219,19 +331,13 @@ Rules: translation MUST be in {lang_name} script. All meanings/notes in {source_
         result["pronunciation"] = det_pron
 
     breakdown = result.get("breakdown", [])
-    for item in breakdown:
-        word = item.get("word", "")
-        word_pron = deterministic_word_pronunciation(word, lang_code)
-        if word_pron:
-            item["pronunciation"] = word_pron
+    apply_word_pronunciations(breakdown, lang_code)
 
     # Re-segment Chinese breakdowns if character-by-character
     if lang_code == "zh" and breakdown and translation_text:
         avg_word_len = sum(len(item.get("word", "")) for item in breakdown) / max(len(breakdown), 1)
         if avg_word_len <= 1.2 and len(breakdown) > 3:
-            import jieba
-            words = list(jieba.cut(translation_text.replace("，", "").replace("。", "").replace("！", "").replace("？", "")))
-            words = [w.strip() for w in words if w.strip()]
+            words = await asyncio.to_thread(jieba_words, translation_text)
             new_breakdown = []
             for w in words:
                 pron = deterministic_word_pronunciation(w, lang_code) or ""
@@ -246,20 +352,12 @@ Rules: translation MUST be in {lang_name} script. All meanings/notes in {source_
 
     # Filter hallucinated breakdown words
     if breakdown and translation_text:
-        clean_translation = translation_text.replace(" ", "").replace("，", "").replace(",", "").replace("。", "").replace(".", "").replace("！", "").replace("!", "").replace("？", "").replace("?", "")
-        result["breakdown"] = [item for item in breakdown if item.get("word", "").replace(" ", "") in clean_translation]
+        result["breakdown"] = _words_in_translation(breakdown, translation_text)
 
     # Japanese gender/pronoun warnings
     if lang_code == "ja" and translation_text:
-        gender_markers = {
-            "私": ("watashi", "neutral/formal, used by all genders"),
-            "僕": ("boku", "masculine, casual — used by boys/men"),
-            "俺": ("ore", "masculine, very casual/rough — used by men"),
-            "あたし": ("atashi", "feminine, casual — used by women/girls"),
-            "わたくし": ("watakushi", "very formal, gender-neutral"),
-        }
         detected = []
-        for marker, (reading, desc) in gender_markers.items():
+        for marker, reading, desc in _JA_GENDER_MARKERS:
             if marker in translation_text:
                 detected.append(f"⚠️ '{marker}' ({reading}): {desc}")
         if detected:
@@ -280,13 +378,12 @@ Rules: translation MUST be in {lang_name} script. All meanings/notes in {source_
             native_sentence = native.strip()
             native_explanation = ""
 
-        if native_sentence.replace("。", "").replace("！", "").replace("？", "").strip() == translation.replace("。", "").replace("！", "").replace("？", "").strip():
+        if native_sentence.translate(_SENTENCE_END_STRIP_TABLE).strip() == translation.translate(_SENTENCE_END_STRIP_TABLE).strip():
             result["native_expression"] = None
         elif native_sentence:
             native_pron = deterministic_pronunciation(native_sentence, lang_code) or ""
             if native_explanation:
-                cjk_count = sum(1 for c in native_explanation if '\u4e00' <= c <= '\u9fff')
-                cjk_ratio = cjk_count / max(len(native_explanation), 1)
+                cjk_ratio = _han_ratio(native_explanation)
                 if not input_is_chinese and cjk_ratio > 0.3:
                     native_explanation = ""
                 elif input_is_chinese and cjk_ratio < 0.1 and len(native_explanation) > 10:
@@ -296,14 +393,13 @@ Rules: translation MUST be in {lang_name} script. All meanings/notes in {source_
     # Taiwanese native phrases
     if lang_code == "zh":
         try:
-            phrases_file = Path(__file__).parent / "taiwanese_phrases.json"
-            if phrases_file.exists():
-                tw_data = json.loads(phrases_file.read_text())
+            tw_phrases = _load_tw_phrases()
+            if tw_phrases:
                 input_lower = req.sentence.lower()
                 trans_text = translation_text or ""
                 matches = []
-                for p in tw_data.get("phrases", []):
-                    score = sum(1 for kw in p["keywords"] if kw.lower() in input_lower or kw in trans_text)
+                for p, keywords in tw_phrases:
+                    score = sum(1 for kw_lower, kw in keywords if kw_lower in input_lower or kw in trans_text)
                     if score > 0:
                         matches.append((score, p))
                 matches.sort(key=lambda x: -x[0])
@@ -319,9 +415,8 @@ Rules: translation MUST be in {lang_name} script. All meanings/notes in {source_
     # Enforce explanations in source language for English input
     if not input_is_chinese:
         def _mostly_cjk(s):
-            if not s: return False
-            cjk = sum(1 for c in s if '\u4e00' <= c <= '\u9fff')
-            return cjk / max(len(s.replace(" ", "")), 1) > 0.3
+            if not s or not _HAN_RE.search(s): return False
+            return _han_ratio(s, len(s.replace(" ", ""))) > 0.3
 
         notes = result.get("grammar_notes", []) or []
         cleaned_notes = []
@@ -329,8 +424,8 @@ Rules: translation MUST be in {lang_name} script. All meanings/notes in {source_
             if not _mostly_cjk(note):
                 cleaned_notes.append(note)
             else:
-                salvaged = _re.sub(r'[\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af]+', '', note).strip()
-                salvaged = _re.sub(r'\s+', ' ', salvaged).strip(' ()-:,.')
+                salvaged = _CJK_KANA_HANGUL_RUN_RE.sub('', note).strip()
+                salvaged = _WS_RE.sub(' ', salvaged).strip(' ()-:,.')
                 if len(salvaged) > 15:
                     cleaned_notes.append(salvaged)
         result["grammar_notes"] = cleaned_notes
@@ -342,10 +437,10 @@ Rules: translation MUST be in {lang_name} script. All meanings/notes in {source_
 
         for item in result.get("breakdown", []):
             meaning = item.get("meaning", "")
-            if any('\u4e00' <= c <= '\u9fff' for c in meaning):
-                cleaned = _re.sub(r'[\u4e00-\u9fff]+', '', meaning).strip()
-                cleaned = _re.sub(r'^\(?\s*', '', cleaned)
-                cleaned = _re.sub(r'\s*\)?\s*$', '', cleaned)
+            if _HAN_RE.search(meaning):
+                cleaned = _HAN_RUN_RE.sub('', meaning).strip()
+                cleaned = _LEADING_PAREN_RE.sub('', cleaned)
+                cleaned = _TRAILING_PAREN_RE.sub('', cleaned)
                 if cleaned:
                     item["meaning"] = cleaned
 
@@ -356,15 +451,14 @@ Rules: translation MUST be in {lang_name} script. All meanings/notes in {source_
     result.setdefault("target_language", req.target_language)
     result["detected_input_language"] = "zh" if input_is_chinese else "en"
     result = ensure_traditional_chinese(result)
-    cache_put(ck, result)
+    # Linked so negative feedback also evicts the raw completion from the LLM cache
+    cache_put(ck, result, llm_key=llm_cache_key(model, temperature, num_predict, messages))
 
     try:
         extract_and_store_grammar_patterns(result, lang_code, req.sentence)
     except Exception:
         logger.exception("Grammar extraction error", extra={"component": "grammar"})
 
-    decrement_user_request()
-
     return result
 
 
@@ -376,7 +470,6 @@ async def learn_fast(
 ):
 
     rate_key = get_rate_limit_key(request)
-    rate_limit_cleanup()
     if not rate_limit_check(rate_key):
         raise HTTPException(429, "Too many requests. Please wait a minute.")
 
@@ -393,36 +486,21 @@ async def learn_fast(
     ck = cache_key(req.sentence, req.target_language, gender, formality)
     cached = cache_get(ck)
     if cached:
-        if "difficulty" not in cached or cached.get("difficulty") is None:
-            sd = detect_sentence_difficulty(req.sentence, cached.get("breakdown", []))
-            cached["sentence_difficulty"] = sd
-            cached["difficulty"] = sd.get("level")
         return {**cached, "complete": True}
 
-    lang_name = SUPPORTED_LANGUAGES[req.target_language]
-    lang_code = req.target_language
-    input_is_chinese = _detect_input_language(req.sentence, getattr(req, 'input_language', 'auto') or 'auto')
-    source_lang_short = "繁體中文" if input_is_chinese else "English"
-
-    script_examples = {
-        "ko": "Korean script (한국어)", "ja": "Japanese script (日本語)",
-        "he": "Hebrew script (עברית)", "el": "Greek script (Ελληνικά)",
-        "zh": "Traditional Chinese (繁體中文)", "en": "English",
-        "it": "Italian", "es": "Spanish",
-    }
-    script_hint = script_examples.get(lang_code, f"{lang_name} script")
-
-    prompt = f"""Translate into {lang_name} ({script_hint}): "{req.sentence}"
-Speaker: {gender}, {formality}. Explain in {source_lang_short}.
-JSON only: {{"translation":"...","pronunciation":"romanized","literal":"word-by-word in {source_lang_short}","formality":"{formality}","native_expression":"native way | pronunciation | explanation in {source_lang_short}, or null"}}"""
+    lang_code, lang_name, input_is_chinese, source_lang_short = _learn_context(req)
 
-    system_msg = f"{lang_name} translator. JSON only."
-    if lang_code == "zh":
-        system_msg += " 繁體中文 Taiwan usage only."
+    prompt = LEARN_FAST_TMPL.format_map({
+        "lang_name": lang_name, "script_hint": _SCRIPT_HINTS_SHORT.get(lang_code) or f"{lang_name} script",
+        "sentence": req.sentence, "gender": gender, "formality": formality,
+        "source_lang_short": source_lang_short,
+    })
+    system_msg = _LEARN_FAST_SYSTEM[lang_code]
 
     text = await ollama_chat(
         [{"role": "system", "content": system_msg}, {"role": "user", "content": prompt}],
-        model=get_model_for_language(lang_code), temperature=0.3, num_predict=192, timeout=25
+        model=get_model_for_language(lang_code), temperature=0.3, num_predict=192, timeout=25,
+        early_stop=json_object_complete,
     )
 
     if text is None:
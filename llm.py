@@ -1,10 +1,14 @@
 """LLM interaction (Ollama), prompt building, pronunciation, and post-processing."""
-import json
+import os
+import asyncio
 import re as _re
-import hashlib
-import random
-import time
-from typing import Optional, List, Dict, Any
+import sys
+import secrets
+import functools
+import contextlib
+import contextvars
+import threading
+from typing import Optional, List, Dict, Any, Callable, AsyncIterator
 from pathlib import Path
 
 from log import get_logger
@@ -12,13 +16,10 @@ from log import get_logger
 logger = get_logger("sentsei.llm")
 
 import httpx
-import MeCab
-import pykakasi
-from pypinyin import pinyin, Style as PinyinStyle
-from korean_romanizer.romanizer import Romanizer
-from opencc import OpenCC
+import orjson
 
 from models import SUPPORTED_LANGUAGES
+from cache import LLM_CACHE_MAX_TEMPERATURE, llm_cache_key, llm_cache_get, llm_cache_put
 
 # --- Config ---
 OLLAMA_URL = "http://localhost:11434"
@@ -37,11 +38,25 @@ def get_model_for_language(lang_code: str) -> str:
     return LANGUAGE_MODEL_OVERRIDES.get(lang_code, OLLAMA_MODEL)
 
 # --- Pronunciation ---
-_kakasi = pykakasi.kakasi()
-_mecab_tagger = MeCab.Tagger()
-_s2twp = OpenCC('s2twp')
-_s2t = OpenCC('s2t')
-_t2s = OpenCC('t2s')
+# Backends are imported on first use so processes that never touch a given
+# language don't pay its import/initialisation cost.
+
+@functools.lru_cache(maxsize=None)
+def _get_kakasi():
+    import pykakasi
+    return pykakasi.kakasi()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_mecab_tagger():
+    import MeCab
+    return MeCab.Tagger()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_opencc(config: str):
+    from opencc import OpenCC
+    return OpenCC(config)
 
 # Common reading overrides (MeCab/unidic sometimes gives formal readings)
 _JA_READING_OVERRIDES = {
@@ -56,7 +71,7 @@ _JA_PUNCT = set("、。！？「」『』（）…—·〜～，")
 
 def _katakana_to_romaji(kata: str) -> str:
     """Convert katakana string to Hepburn romaji via pykakasi."""
-    conv = _kakasi.convert(kata)
+    conv = _get_kakasi().convert(kata)
     return "".join(item["hepburn"] for item in conv)
 
 
@@ -81,7 +96,7 @@ def _japanese_pronunciation(text: str) -> str:
     - Common reading overrides (私→watashi, not watakushi)
     - Punctuation stripped from output
     """
-    node = _mecab_tagger.parseToNode(text)
+    node = _get_mecab_tagger().parseToNode(text)
     parts = []
     while node:
         surface = node.surface
@@ -346,31 +361,53 @@ def _greek_romanize(text: str) -> str:
     return "".join(result)
 
 
-def deterministic_pronunciation(text: str, lang_code: str) -> Optional[str]:
+@functools.lru_cache(maxsize=None)
+def _pronouncer(lang_code: str) -> Optional[Callable[[str], str]]:
+    """Return the romanizer for *lang_code* (importing its library once), or None."""
     if lang_code == "ja":
-        return _japanese_pronunciation(text)
+        return _japanese_pronunciation
     elif lang_code == "zh":
-        result = pinyin(text, style=PinyinStyle.TONE)
-        return " ".join(p[0] for p in result)
+        from pypinyin import pinyin, Style as PinyinStyle
+        return lambda text: " ".join(p[0] for p in pinyin(text, style=PinyinStyle.TONE))
     elif lang_code == "ko":
-        r = Romanizer(text)
-        return r.romanize()
+        from korean_romanizer.romanizer import Romanizer
+        return lambda text: Romanizer(text).romanize()
     elif lang_code == "el":
-        return _greek_romanize(text)
+        return _greek_romanize
     elif lang_code == "he":
-        return _hebrew_romanize(text)
+        return _hebrew_romanize
     elif lang_code in ("it", "es", "en"):
-        return text
+        return lambda text: text
     return None
 
 
+def deterministic_pronunciation(text: str, lang_code: str) -> Optional[str]:
+    pronounce = _pronouncer(lang_code)
+    return pronounce(text) if pronounce else None
+
+
+# Words repeat heavily across breakdowns (的, です, 는...); romanizing is pure, so memoize
+@functools.lru_cache(maxsize=32768)
 def deterministic_word_pronunciation(word: str, lang_code: str) -> Optional[str]:
     return deterministic_pronunciation(word, lang_code)
 
 
+def apply_word_pronunciations(breakdown: list, lang_code: str):
+    """Overwrite each breakdown item's pronunciation with the deterministic one, when available."""
+    if _pronouncer(lang_code) is None:
+        return
+    for item in breakdown:
+        word_pron = deterministic_word_pronunciation(item.get("word", ""), lang_code)
+        if word_pron:
+            item["pronunciation"] = word_pron
+
+
 def ensure_traditional_chinese(obj):
     if isinstance(obj, str):
-        return _s2twp.convert(obj)
+        # OpenCC only rewrites Han characters; skip the conversion for everything else
+        if _HAN_RE.search(obj) is None:
+            return obj
+        return _get_opencc('s2twp').convert(obj)
     elif isinstance(obj, list):
         return [ensure_traditional_chinese(item) for item in obj]
     elif isinstance(obj, dict):
@@ -378,15 +415,26 @@ def ensure_traditional_chinese(obj):
     return obj
 
 
+# Precompiled scanners so difficulty scoring runs its per-character work in C (re engine)
+_DIFFICULTY_CJK_RE = _re.compile(r"[\u4e00-\u9fff\u3040-\u30ff\uac00-\ud7af]")
+_HAN_RE = _re.compile(r"[\u4e00-\u9fff]")
+_DIFFICULTY_MEANINGFUL_RE = _re.compile(r"[^\s，。！？、「」『』（）…—·]")
+_COMPLEXITY_MARKERS = (
+    'although', 'however', 'nevertheless', 'whereas', 'furthermore',
+    'consequently', 'notwithstanding', 'if', 'because', 'since', 'while',
+    'unless', 'whether', 'whom', 'whose', 'whereby',
+)
+
+
 def detect_sentence_difficulty(sentence: str, breakdown: list = None) -> dict:
     factors = []
     score = 0
     text = sentence.strip()
-    cjk_chars = sum(1 for c in text if '\u4e00' <= c <= '\u9fff' or '\u3040' <= c <= '\u30ff' or '\uac00' <= c <= '\ud7af')
-    is_cjk = cjk_chars / max(len(text.replace(" ", "")), 1) > 0.3
+    cjk_chars = len(_DIFFICULTY_CJK_RE.findall(text))
+    is_cjk = cjk_chars / max(len(text) - text.count(" "), 1) > 0.3
 
     if is_cjk:
-        meaningful = sum(1 for c in text if c.strip() and c not in '，。！？、「」『』（）…—·')
+        meaningful = len(_DIFFICULTY_MEANINGFUL_RE.findall(text))
         if meaningful <= 5:
             score += 5; factors.append("Very short phrase")
         elif meaningful <= 12:
@@ -395,7 +443,9 @@ def detect_sentence_difficulty(sentence: str, breakdown: list = None) -> dict:
             score += 45; factors.append(f"Long sentence ({meaningful} characters)")
         else:
             score += 65; factors.append(f"Very long sentence ({meaningful} characters)")
-        unique_chars = len(set(c for c in text if '\u4e00' <= c <= '\u9fff'))
+        han_chars = _HAN_RE.findall(text)
+        # 8 or fewer Han characters can't cross a diversity threshold, so skip building the set
+        unique_chars = len(set(han_chars)) if len(han_chars) > 8 else 0
         if unique_chars > 15:
             score += 15; factors.append(f"High character diversity ({unique_chars} unique)")
         elif unique_chars > 8:
@@ -416,17 +466,21 @@ def detect_sentence_difficulty(sentence: str, breakdown: list = None) -> dict:
             score += 15; factors.append("Complex vocabulary (long words)")
         elif avg_len > 5:
             score += 8
-        complexity_markers = ['although', 'however', 'nevertheless', 'whereas', 'furthermore',
-                            'consequently', 'notwithstanding', 'if', 'because', 'since', 'while',
-                            'unless', 'whether', 'whom', 'whose', 'whereby']
-        found = [m for m in complexity_markers if m in text.lower()]
+        lower = text.lower()
+        found = [m for m in _COMPLEXITY_MARKERS if m in lower]
         if found:
             score += min(len(found) * 8, 20)
             factors.append(f"Complex grammar ({', '.join(found[:3])})")
 
     if breakdown:
-        hard_count = sum(1 for w in breakdown if w.get("difficulty") == "hard")
-        medium_count = sum(1 for w in breakdown if w.get("difficulty") == "medium")
+        hard_count = 0
+        medium_count = 0
+        for w in breakdown:
+            level = w.get("difficulty")
+            if level == "hard":
+                hard_count += 1
+            elif level == "medium":
+                medium_count += 1
         total = len(breakdown)
         if total > 0:
             hard_ratio = hard_count / total
@@ -447,10 +501,12 @@ def detect_sentence_difficulty(sentence: str, breakdown: list = None) -> dict:
 # --- CC-CEDICT Dictionary ---
 _cedict_data: Dict[str, str] = {}
 _cedict_entries: Dict[str, Dict[str, Any]] = {}
+_cedict_loaded = False
+# /api/segment runs in a worker thread, so the first lookups can race the load
+_cedict_lock = threading.Lock()
 _cedict_line_re = _re.compile(r"^(\S+)\s+(\S+)\s+\[([^\]]+)\]\s+/(.+)/$")
 _cedict_path = Path(__file__).parent / "cedict_dict.json"
-if _cedict_path.exists():
-    _cedict_data = json.loads(_cedict_path.read_text())
+_cedict_txt_path = Path(__file__).parent / "cedict.txt"
 
 
 def _register_cedict_entry(traditional: str, simplified: str, pinyin_num: str, definitions: List[str]):
@@ -483,40 +539,75 @@ def _register_cedict_entry(traditional: str, simplified: str, pinyin_num: str, d
     _cedict_entries[simplified] = entry
 
 
-_cedict_txt_path = Path(__file__).parent / "cedict.txt"
-if _cedict_txt_path.exists():
-    try:
-        with _cedict_txt_path.open("r", encoding="utf-8") as _f:
-            for _line in _f:
-                _line = _line.strip()
-                if not _line or _line.startswith("#"):
-                    continue
-                _m = _cedict_line_re.match(_line)
-                if not _m:
-                    continue
-                _trad, _simp, _pin, _defs_raw = _m.groups()
-                _defs = [x for x in _defs_raw.split("/") if x]
-                _register_cedict_entry(_trad, _simp, _pin, _defs)
-        logger.info("Loaded CEDICT entries", extra={"component": "cedict", "count": len(_cedict_entries)})
-    except Exception:
-        logger.exception("Failed to load CEDICT entries", extra={"component": "cedict"})
+def _ensure_cedict_loaded():
+    """Load CEDICT data on first lookup rather than at import.
+
+    Other callers block until both sources are loaded; the flag is only set
+    once they are, so no lookup ever sees a half-built dictionary.
+    """
+    global _cedict_data, _cedict_loaded
+    if _cedict_loaded:
+        return
+    with _cedict_lock:
+        if _cedict_loaded:
+            return
+        if _cedict_path.exists():
+            _cedict_data = orjson.loads(_cedict_path.read_bytes())
+        if _cedict_txt_path.exists():
+            try:
+                with _cedict_txt_path.open("r", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line or line.startswith("#"):
+                            continue
+                        m = _cedict_line_re.match(line)
+                        if not m:
+                            continue
+                        trad, simp, pin, defs_raw = m.groups()
+                        defs = [x for x in defs_raw.split("/") if x]
+                        _register_cedict_entry(trad, simp, pin, defs)
+                logger.info("Loaded CEDICT entries", extra={"component": "cedict", "count": len(_cedict_entries)})
+            except Exception:
+                logger.exception("Failed to load CEDICT entries", extra={"component": "cedict"})
+        _cedict_loaded = True
+
 
 _jieba_dict_path = Path(__file__).parent / "jieba_tw_dict.txt"
-if _jieba_dict_path.exists():
-    import jieba as _jieba_init
-    with open(_jieba_dict_path) as _f:
-        for _line in _f:
-            _w = _line.strip()
-            if _w:
-                _jieba_init.add_word(_w)
-
-_particle_overrides = {
+
+
+@functools.lru_cache(maxsize=None)
+def get_jieba():
+    """Return the jieba module with the Taiwan word list registered (loaded on first use)."""
+    import jieba
+    if _jieba_dict_path.exists():
+        with open(_jieba_dict_path) as f:
+            for line in f:
+                w = line.strip()
+                if w:
+                    jieba.add_word(w)
+    return jieba
+
+
+# Punctuation stripped before jieba segmentation, as str.translate tables
+ZH_SENTENCE_PUNCT_TABLE = str.maketrans("", "", "，。！？")
+ZH_PUNCT_TABLE = str.maketrans("", "", "，。！？、「」…")
+
+
+def jieba_words(text: str) -> list:
+    """Segment Chinese *text* with jieba, ignoring sentence punctuation and blank tokens.
+
+    Blocking (and slow if jieba is not loaded yet): call via asyncio.to_thread.
+    """
+    return [w for w in (t.strip() for t in get_jieba().cut(text.translate(ZH_SENTENCE_PUNCT_TABLE))) if w]
+
+# Interned: these definitions are handed out for every particle in every breakdown
+_particle_overrides = {sys.intern(k): sys.intern(v) for k, v in {
     "的": "(possessive/descriptive particle)", "了": "(completion/change particle)",
     "是": "is; am; are", "在": "at; in; (progressive particle)", "把": "(object-marking particle)",
     "被": "(passive particle)", "得": "(complement particle)", "地": "(adverbial particle)",
     "著": "(continuous aspect particle)", "過": "(experiential particle)",
     "會": "will; can", "能": "can; able to", "要": "want; need; will",
-}
+}.items()}
 
 
 def _best_definition(definitions: List[str]) -> str:
@@ -541,9 +632,10 @@ def get_cedict_entry(word: str) -> Optional[Dict[str, Any]]:
     if not clean:
         return None
 
+    _ensure_cedict_loaded()
     if clean in _particle_overrides:
-        trad = _s2t.convert(clean)
-        simp = _t2s.convert(trad)
+        trad = _get_opencc('s2t').convert(clean)
+        simp = _get_opencc('t2s').convert(trad)
         return {
             "traditional": trad,
             "simplified": simp,
@@ -552,7 +644,7 @@ def get_cedict_entry(word: str) -> Optional[Dict[str, Any]]:
         }
 
     candidates = [clean]
-    for variant in (_s2t.convert(clean), _s2twp.convert(clean), _t2s.convert(clean)):
+    for variant in (_get_opencc('s2t').convert(clean), _get_opencc('s2twp').convert(clean), _get_opencc('t2s').convert(clean)):
         if variant and variant not in candidates:
             candidates.append(variant)
 
@@ -561,7 +653,7 @@ def get_cedict_entry(word: str) -> Optional[Dict[str, Any]]:
         if entry:
             return {
                 "traditional": entry.get("traditional", token),
-                "simplified": entry.get("simplified", _t2s.convert(token)),
+                "simplified": entry.get("simplified", _get_opencc('t2s').convert(token)),
                 "pinyin": entry.get("pinyin", ""),
                 "definitions": list(entry.get("definitions", [])),
             }
@@ -569,8 +661,8 @@ def get_cedict_entry(word: str) -> Optional[Dict[str, Any]]:
     for token in candidates:
         meaning = _cedict_data.get(token)
         if meaning:
-            trad = _s2t.convert(token)
-            simp = _t2s.convert(trad)
+            trad = _get_opencc('s2t').convert(token)
+            simp = _get_opencc('t2s').convert(trad)
             return {
                 "traditional": trad,
                 "simplified": simp,
@@ -581,6 +673,16 @@ def get_cedict_entry(word: str) -> Optional[Dict[str, Any]]:
 
 
 def cedict_lookup(word: str) -> Optional[str]:
+    # Finish the lazy load before consulting the memo, so no lookup made
+    # against a partial dictionary can be cached
+    _ensure_cedict_loaded()
+    return _cedict_lookup_loaded(word)
+
+
+# CEDICT is loaded once and never changes, so lookups (mostly single common
+# characters from the per-character fallback) are safe to memoize
+@functools.lru_cache(maxsize=32768)
+def _cedict_lookup_loaded(word: str) -> Optional[str]:
     entry = get_cedict_entry(word)
     if not entry:
         return None
@@ -699,45 +801,56 @@ def build_dictionary_word_detail(word: str, meaning: str, target_language: str,
 
 def parse_json_object(text: str) -> Optional[dict]:
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        match = _re.search(r'\{.*\}', text, _re.DOTALL)
-        if not match:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        # Fall back to the outermost {...} span (e.g. JSON wrapped in prose or code fences)
+        start = text.find("{")
+        end = text.rfind("}")
+        if start == -1 or end < start:
             return None
         try:
-            return json.loads(match.group())
-        except json.JSONDecodeError:
+            return orjson.loads(text[start:end + 1])
+        except orjson.JSONDecodeError:
             return None
 
 
+def json_object_complete(text: str) -> bool:
+    """Early-stop predicate for ollama_chat: True once a complete JSON object has been emitted."""
+    return text.rstrip().endswith("}") and parse_json_object(text) is not None
+
+
 def split_sentences(text: str) -> List[str]:
     parts = _re.split(r'(?<=[.!?。！？])\s*', text.strip())
     return [s.strip() for s in parts if s.strip()]
 
 
 def new_quiz_id(lang: str, sentence: str) -> str:
-    raw = f"{lang}|{sentence}|{time.time_ns()}|{random.random()}"
-    return hashlib.sha256(raw.encode()).hexdigest()[:20]
+    return secrets.token_hex(10)
+
+
+_HINT_SPLIT_RE = _re.compile(r"\s+")
+_HINT_TRIM_RE = _re.compile(r"^[^\w\u4e00-\u9fff]+|[^\w\u4e00-\u9fff]+$")
 
 
 def translation_hint(text: str) -> str:
     cleaned = (text or "").strip().strip("\"'""''")
     if not cleaned:
         return ""
-    first = _re.split(r"\s+", cleaned)[0]
-    first = _re.sub(r"^[^\w\u4e00-\u9fff]+|[^\w\u4e00-\u9fff]+$", "", first)
+    first = _HINT_SPLIT_RE.split(cleaned, 1)[0]
+    first = _HINT_TRIM_RE.sub("", first)
     if not first:
         first = cleaned[:2]
-    if any('\u4e00' <= c <= '\u9fff' for c in first) and len(first) > 2:
+    if len(first) > 2 and _HAN_RE.search(first):
         first = first[:2]
     return first
 
 
+_TSV_TABLE = str.maketrans({"\r": " ", "\n": " ", "\t": " "})
+
+
 def sanitize_tsv_cell(value: Optional[str]) -> str:
-    text = (value or "")
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-    text = text.replace("\t", " ").replace("\n", " ")
-    return text.strip()
+    text = (value or "").replace("\r\n", "\n")
+    return text.translate(_TSV_TABLE).strip()
 
 
 def anki_language_label(code: str) -> str:
@@ -753,55 +866,287 @@ def normalize_word_detail_payload(payload: Optional[Dict[str, Any]]) -> Dict[str
     return result
 
 
-async def llm_word_detail(word: str, meaning: str, target_language: str) -> Optional[Dict[str, Any]]:
-    """Fallback word-detail generation through LLM."""
+WORD_DETAIL_TMPL = """Word: "{word}" ({lang_name}, meaning: {meaning}).
+Return JSON only: {{"examples":[{{"sentence":"..","pronunciation":"..","meaning":".."}}],"conjugations":[{{"form":"..","label":".."}}],"related":[{{"word":"..","meaning":".."}}]}}
+2 examples, 2-3 conjugations ([] if none), 2 related words. Explanations in {explain_lang}. Simple sentences."""
+
+_WORD_DETAIL_SYSTEM = {code: f"{name} vocab teacher. JSON only." for code, name in SUPPORTED_LANGUAGES.items()}
+
+
+def word_detail_messages(word: str, meaning: str, target_language: str) -> List[Dict[str, str]]:
+    """Build the chat messages for LLM word-detail generation."""
     lang_name = SUPPORTED_LANGUAGES[target_language]
-    meaning_is_chinese = any('\u4e00' <= c <= '\u9fff' for c in (meaning or ""))
+    meaning_is_chinese = _HAN_RE.search(meaning or "") is not None
     explain_lang = "繁體中文" if meaning_is_chinese else "English"
 
-    prompt = f"""Word: "{word}" ({lang_name}, meaning: {meaning}).
-Return JSON only: {{"examples":[{{"sentence":"..","pronunciation":"..","meaning":".."}}],"conjugations":[{{"form":"..","label":".."}}],"related":[{{"word":"..","meaning":".."}}]}}
-2 examples, 2-3 conjugations ([] if none), 2 related words. Explanations in {explain_lang}. Simple sentences."""
+    prompt = WORD_DETAIL_TMPL.format_map({
+        "word": word, "lang_name": lang_name, "meaning": meaning, "explain_lang": explain_lang,
+    })
+    return [{"role": "system", "content": _WORD_DETAIL_SYSTEM[target_language]},
+            {"role": "user", "content": prompt}]
 
-    text = await ollama_chat(
-        [{"role": "system", "content": f"{lang_name} vocab teacher. JSON only."},
-         {"role": "user", "content": prompt}],
-        model=get_model_for_language(target_language), temperature=0.3, num_predict=512, timeout=45
-    )
-    if text is None:
-        return None
+
+def parse_word_detail(text: str) -> Dict[str, Any]:
+    """Turn raw LLM word-detail output into a normalized payload."""
     parsed = parse_json_object(text)
     if not parsed:
         return {"examples": [], "conjugations": [], "related": []}
     return normalize_word_detail_payload(ensure_traditional_chinese(parsed))
 
 
+async def llm_word_detail(word: str, meaning: str, target_language: str) -> Optional[Dict[str, Any]]:
+    """Fallback word-detail generation through LLM."""
+    text = await ollama_chat(
+        word_detail_messages(word, meaning, target_language),
+        model=get_model_for_language(target_language), temperature=0.3, num_predict=512, timeout=45,
+        early_stop=json_object_complete,
+    )
+    if text is None:
+        return None
+    return parse_word_detail(text)
+
+
+# Ollama batches concurrent requests across its OLLAMA_NUM_PARALLEL slots (it has no
+# multi-prompt chat endpoint), so feed it at most that many at once and queue the rest here.
+OLLAMA_NUM_PARALLEL = int(os.environ.get("OLLAMA_NUM_PARALLEL", "4"))
+_ollama_slots = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+
+# Number of Ollama calls holding or waiting for a slot. Background work (the
+# surprise bank) waits on _ollama_idle so it only runs when users aren't.
+_ollama_in_flight = 0
+_ollama_idle: Optional[asyncio.Event] = None
+
+
+def _get_ollama_idle() -> asyncio.Event:
+    global _ollama_idle
+    if _ollama_idle is None:
+        _ollama_idle = asyncio.Event()
+        _ollama_idle.set()
+    return _ollama_idle
+
+
+@contextlib.asynccontextmanager
+async def _ollama_slot():
+    """Hold one of the OLLAMA_NUM_PARALLEL slots, tracking in-flight calls exception-safely."""
+    global _ollama_in_flight
+    _ollama_in_flight += 1
+    _get_ollama_idle().clear()
+    try:
+        async with _ollama_slots:
+            yield
+    finally:
+        _ollama_in_flight -= 1
+        if _ollama_in_flight == 0:
+            _get_ollama_idle().set()
+
+
+def ollama_busy() -> bool:
+    return _ollama_in_flight > 0
+
+
+async def wait_ollama_idle():
+    """Wait until no Ollama call is running or queued."""
+    await _get_ollama_idle().wait()
+
+
+# Called with the running count of streamed content deltas while a completion
+# generates; set by callers (e.g. /api/learn-stream) that report real progress.
+ollama_progress: contextvars.ContextVar[Optional[Callable[[int], None]]] = contextvars.ContextVar(
+    "ollama_progress", default=None)
+
+# How long Ollama keeps a model loaded after a request (-1 = never unload).
+# Finite by default so per-language models don't stay pinned in VRAM; set
+# OLLAMA_KEEP_ALIVE=-1 on hosts with room for every model.
+_keep_alive_env = os.environ.get("OLLAMA_KEEP_ALIVE", "10m")
+OLLAMA_KEEP_ALIVE = int(_keep_alive_env) if _keep_alive_env.lstrip("-").isdigit() else _keep_alive_env
+
+OLLAMA_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30)
+# Ollama is local: a connect that takes longer than this means it is down, so
+# fail fast rather than waiting out the (long) generation timeout.
+OLLAMA_CONNECT_TIMEOUT = 5.0
+
+
+def _ollama_timeout(total: float) -> httpx.Timeout:
+    """Per-request timeout: *total* for reads/writes, but a short connect timeout."""
+    return httpx.Timeout(total, connect=OLLAMA_CONNECT_TIMEOUT)
+
+_ollama_client: Optional[httpx.AsyncClient] = None
+
+
+def get_ollama_client() -> httpx.AsyncClient:
+    """Return the shared Ollama client (created at app startup, or on first use)."""
+    global _ollama_client
+    if _ollama_client is None or _ollama_client.is_closed:
+        _ollama_client = httpx.AsyncClient(
+            base_url=OLLAMA_URL,
+            timeout=_ollama_timeout(120.0),
+            limits=OLLAMA_HTTP_LIMITS,
+        )
+    return _ollama_client
+
+
+async def close_ollama_client():
+    global _ollama_client
+    if _ollama_client is not None:
+        await _ollama_client.aclose()
+        _ollama_client = None
+
+
 async def ollama_chat(messages: list, model: str = None, temperature: float = 0.3,
-                      num_predict: int = 2048, timeout: int = 120) -> str:
-    """Call Ollama chat API and return the content string."""
+                      num_predict: int = 2048, timeout: int = 120,
+                      early_stop: Optional[Callable[[str], bool]] = None,
+                      keep_alive: Any = OLLAMA_KEEP_ALIVE) -> str:
+    """Call Ollama chat API and return the content string.
+
+    Low-temperature calls are served from the exact-match LLM cache when the
+    same model/options/messages were seen before.
+
+    If ``early_stop`` is given, the completion is streamed and generation is
+    abandoned as soon as ``early_stop(content_so_far)`` returns True (e.g.
+    ``json_object_complete`` for JSON prompts).
+
+    At most OLLAMA_NUM_PARALLEL requests are sent to Ollama concurrently.
+    """
     if model is None:
         model = OLLAMA_MODEL
-    async with httpx.AsyncClient(timeout=timeout) as client:
+    cacheable = temperature <= LLM_CACHE_MAX_TEMPERATURE
+    if cacheable:
+        lck = llm_cache_key(model, temperature, num_predict, messages)
+        cached = llm_cache_get(lck)
+        if cached is not None:
+            return cached
+    async with _ollama_slot():
+        if cacheable:
+            # An identical prompt may have completed while we waited for a slot
+            cached = llm_cache_get(lck)
+            if cached is not None:
+                return cached
+        content = await _ollama_chat_request(model, messages, temperature, num_predict, timeout, early_stop, keep_alive)
+        if cacheable and content:
+            llm_cache_put(lck, content)
+    return content
+
+
+def _chat_body(model: str, messages: list, temperature: float, num_predict: int, stream: bool,
+               keep_alive: Any = OLLAMA_KEEP_ALIVE) -> bytes:
+    return orjson.dumps({
+        "model": model,
+        "messages": messages,
+        "stream": stream,
+        "keep_alive": keep_alive,
+        "options": {"temperature": temperature, "num_predict": num_predict},
+    })
+
+
+async def _iter_stream_content(resp: httpx.Response) -> AsyncIterator[str]:
+    """Yield message content deltas from a streamed (NDJSON) Ollama chat response."""
+    async for line in resp.aiter_lines():
+        if not line:
+            continue
+        chunk = orjson.loads(line)
+        piece = chunk.get("message", {}).get("content", "")
+        if piece:
+            yield piece
+        if chunk.get("done"):
+            return
+
+
+async def _ollama_chat_request(model: str, messages: list, temperature: float, num_predict: int,
+                               timeout: int, early_stop: Optional[Callable[[str], bool]],
+                               keep_alive: Any = OLLAMA_KEEP_ALIVE) -> Optional[str]:
+    body = _chat_body(model, messages, temperature, num_predict, stream=early_stop is not None, keep_alive=keep_alive)
+    client = get_ollama_client()
+    if early_stop is None:
         resp = await client.post(
-            f"{OLLAMA_URL}/api/chat",
-            json={
-                "model": model,
-                "messages": messages,
-                "stream": False,
-                "keep_alive": "10m",
-                "options": {"temperature": temperature, "num_predict": num_predict},
-            },
+            "/api/chat",
+            content=body,
+            headers={"Content-Type": "application/json"},
+            timeout=_ollama_timeout(timeout),
         )
-    if resp.status_code != 200:
-        return None
-    return resp.json().get("message", {}).get("content", "")
+        if resp.status_code != 200:
+            return None
+        return orjson.loads(resp.content).get("message", {}).get("content", "")
+
+    content = ""
+    async with client.stream(
+        "POST", "/api/chat",
+        content=body,
+        headers={"Content-Type": "application/json"},
+        timeout=_ollama_timeout(timeout),
+    ) as resp:
+        if resp.status_code != 200:
+            return None
+        progress = ollama_progress.get()
+        deltas = 0
+        async for piece in _iter_stream_content(resp):
+            content += piece
+            if progress is not None:
+                deltas += 1
+                progress(deltas)
+            if early_stop(content):
+                break
+    return content
+
+
+async def ollama_chat_stream(messages: list, model: str = None, temperature: float = 0.3,
+                             num_predict: int = 2048, timeout: int = 120,
+                             keep_alive: Any = OLLAMA_KEEP_ALIVE) -> AsyncIterator[str]:
+    """Stream content deltas from Ollama as they are generated.
+
+    Shares the LLM cache and concurrency slots with ``ollama_chat``; a cache hit
+    is yielded as a single delta. Raises ``httpx.HTTPStatusError`` if Ollama
+    answers with an error status. Consumers may stop iterating early (close the
+    generator, e.g. via ``contextlib.aclosing``) to abandon generation.
+    """
+    if model is None:
+        model = OLLAMA_MODEL
+    cacheable = temperature <= LLM_CACHE_MAX_TEMPERATURE
+    if cacheable:
+        lck = llm_cache_key(model, temperature, num_predict, messages)
+        cached = llm_cache_get(lck)
+        if cached is not None:
+            yield cached
+            return
+    async with _ollama_slot():
+        content = ""
+        async with get_ollama_client().stream(
+            "POST", "/api/chat",
+            content=_chat_body(model, messages, temperature, num_predict, stream=True, keep_alive=keep_alive),
+            headers={"Content-Type": "application/json"},
+            timeout=_ollama_timeout(timeout),
+        ) as resp:
+            resp.raise_for_status()
+            async for piece in _iter_stream_content(resp):
+                content += piece
+                yield piece
+        if cacheable and content:
+            llm_cache_put(lck, content)
+
+
+async def warm_ollama_models():
+    """Load the default model, so the first user request isn't a cold start.
+
+    Only OLLAMA_MODEL is warmed: loading every per-language override as well
+    could evict models from each other on a GPU that can't hold them all.
+    A chat request with no messages makes Ollama load the model without generating.
+    """
+    model = OLLAMA_MODEL
+    try:
+        resp = await get_ollama_client().post("/api/chat", content=orjson.dumps({
+            "model": model, "messages": [], "keep_alive": OLLAMA_KEEP_ALIVE,
+        }), headers={"Content-Type": "application/json"}, timeout=_ollama_timeout(300))
+        if resp.status_code == 200:
+            logger.info("Ollama model loaded", extra={"component": "ollama", "detail": model})
+        else:
+            logger.warning("Ollama model warm-up failed", extra={"component": "ollama", "detail": model, "status_code": resp.status_code})
+    except Exception:
+        logger.warning("Ollama model warm-up failed", extra={"component": "ollama", "detail": model})
 
 
 async def check_ollama_connectivity() -> bool:
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.get(f"{OLLAMA_URL}/api/tags")
-            return resp.status_code == 200
+        resp = await get_ollama_client().get("/api/tags", timeout=_ollama_timeout(10))
+        return resp.status_code == 200
     except Exception:
         logger.warning("Ollama not reachable", extra={"component": "ollama"})
         return False
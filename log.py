@@ -5,12 +5,17 @@ Set SENTSEI_LOG_LEVEL env var to control verbosity (DEBUG/INFO/WARNING/ERROR).
 Set SENTSEI_LOG_FORMAT=text for human-readable output instead of JSON.
 """
 import logging
-import json
 import os
 import sys
 import time
 from typing import Any
 
+import orjson
+
+
+# Extra fields copied from `extra=` onto the JSON line when present
+_EXTRA_KEYS = ("component", "detail", "duration_ms", "count", "endpoint", "status_code", "ip")
+
 
 class JSONFormatter(logging.Formatter):
     """Formats log records as single-line JSON objects."""
@@ -26,11 +31,15 @@ class JSONFormatter(logging.Formatter):
             entry["error"] = str(record.exc_info[1])
             entry["error_type"] = type(record.exc_info[1]).__name__
         # Include extra fields passed via `extra=`
-        for key in ("component", "detail", "duration_ms", "count", "endpoint", "status_code", "ip"):
+        for key in _EXTRA_KEYS:
             val = getattr(record, key, None)
             if val is not None:
                 entry[key] = val
-        return json.dumps(entry, ensure_ascii=False, default=str)
+        try:
+            return orjson.dumps(entry).decode()
+        except TypeError:
+            # Non-JSON-native extra value; stringify it
+            return orjson.dumps(entry, default=str).decode()
 
 
 def get_logger(name: str = "sentsei") -> logging.Logger:
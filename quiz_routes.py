@@ -1,22 +1,84 @@
 """Quiz endpoints."""
-import json
 import time
+import re as _re
 import random
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Header, Request
 
 from models import SUPPORTED_LANGUAGES, CURATED_SENTENCES, QuizCheckRequest
-from cache import get_quiz_answers, cleanup_quiz_answers
-from auth import APP_PASSWORD, rate_limit_check, rate_limit_cleanup, get_rate_limit_key, require_password
+from cache import get_quiz_answers, cleanup_quiz_answers, store_quiz_answer, quiz_cache_key, quiz_cache_get, quiz_cache_put
+from auth import APP_PASSWORD, rate_limit_check, get_rate_limit_key, require_password
 from llm import (
     OLLAMA_MODEL, deterministic_pronunciation, parse_json_object,
-    new_quiz_id, translation_hint, ollama_chat,
+    new_quiz_id, translation_hint, ollama_chat, json_object_complete,
     get_model_for_language,
 )
 
 router = APIRouter()
 
+QUIZ_PROMPT_TMPL = """Translate this {lang_name} sentence into both English and Traditional Chinese (Taiwan usage).
+
+Sentence: "{sentence}"
+Context:
+- Speaker gender: {gender}
+- Formality: {formality}
+
+Return ONLY valid JSON:
+{{
+  "translation_en": "Natural English meaning",
+  "translation_zh": "Natural Traditional Chinese meaning (Taiwan usage)"
+}}"""
+
+QUIZ_SYSTEM_MSG = "You are a translation assistant. Return valid JSON only."
+
+QUIZ_CHECK_TMPL = """Evaluate whether the learner answer captures the MEANING of the target sentence.
+Do not require exact wording.
+
+Target sentence ({lang_name}): "{sentence}"
+Reference English meaning: "{answer_en}"
+Reference Traditional Chinese meaning: "{answer_zh}"
+Learner answer: "{answer}"
+
+Scoring rubric:
+- perfect: meaning is fully accurate and complete
+- good: meaning is correct with minor wording differences
+- partial: some meaning is correct but key details are missing or off
+- wrong: meaning is mostly incorrect
+
+Return JSON only in this format:
+{{"score": "perfect|good|partial|wrong", "feedback": "brief explanation"}}"""
+
+QUIZ_CHECK_SYSTEM_MSG = "You are a translation quiz grader. Grade semantic equivalence only. Return strict JSON only."
+
+
+async def _quiz_translations(sentence: str, lang: str, lang_name: str, gender: str, formality: str):
+    """Ask the LLM for English and Traditional Chinese meanings of a quiz sentence."""
+    prompt = QUIZ_PROMPT_TMPL.format_map({
+        "lang_name": lang_name, "sentence": sentence, "gender": gender, "formality": formality,
+    })
+
+    text = await ollama_chat(
+        [{"role": "system", "content": QUIZ_SYSTEM_MSG}, {"role": "user", "content": prompt}],
+        model=get_model_for_language(lang), temperature=0.2, num_predict=256, timeout=60,
+        early_stop=json_object_complete,
+    )
+
+    if text is None:
+        raise HTTPException(502, "LLM API error")
+
+    parsed = parse_json_object(text) or {}
+    translation_en = (parsed.get("translation_en") or "").strip()
+    translation_zh = (parsed.get("translation_zh") or "").strip()
+
+    if not translation_en and not translation_zh:
+        raise HTTPException(502, "Failed to generate quiz answer")
+    if not translation_en:
+        translation_en = translation_zh
+    if not translation_zh:
+        translation_zh = translation_en
+    return translation_en, translation_zh
+
 
 @router.api_route("/api/quiz", methods=["GET", "POST"])
 async def get_quiz(
@@ -31,7 +93,6 @@ async def get_quiz(
         raise HTTPException(400, "Unsupported language")
 
     lang_name = SUPPORTED_LANGUAGES[lang]
-    quiz_answers = get_quiz_answers()
 
     history_items = []
     if request.method == "POST":
@@ -42,18 +103,17 @@ async def get_quiz(
             pass
 
     if history_items:
-        picked = random.choice(history_items)
+        picked = history_items[random.randrange(len(history_items))]
         sentence = picked["translation"]
         source_sentence = picked["sentence"]
         pronunciation = picked.get("pronunciation", "")
         quiz_id = new_quiz_id(lang, sentence)
-        cleanup_quiz_answers()
-        quiz_answers[quiz_id] = {
+        store_quiz_answer(quiz_id, {
             "answer_en": source_sentence,
             "answer_zh": source_sentence,
             "sentence": sentence,
             "created_at": time.time(),
-        }
+        })
         return {
             "quiz_id": quiz_id,
             "sentence": sentence,
@@ -63,68 +123,77 @@ async def get_quiz(
             "language": lang,
         }
 
-    sentence_pool = CURATED_SENTENCES.get(lang, [])
+    sentence_pool = CURATED_SENTENCES.get(lang)
     if not sentence_pool:
         raise HTTPException(404, "No curated sentences found for this language")
 
-    picked = random.choice(sentence_pool)
-    sentence = picked["sentence"]
+    picked = sentence_pool[random.randrange(len(sentence_pool))]
+    sentence = picked.sentence
 
-    prompt = f"""Translate this {lang_name} sentence into both English and Traditional Chinese (Taiwan usage).
-
-Sentence: "{sentence}"
-Context:
-- Speaker gender: {gender}
-- Formality: {formality}
-
-Return ONLY valid JSON:
-{{
-  "translation_en": "Natural English meaning",
-  "translation_zh": "Natural Traditional Chinese meaning (Taiwan usage)"
-}}"""
-
-    system_msg = "You are a translation assistant. Return valid JSON only."
-
-    text = await ollama_chat(
-        [{"role": "system", "content": system_msg}, {"role": "user", "content": prompt}],
-        model=get_model_for_language(lang), temperature=0.2, num_predict=256, timeout=60
-    )
-
-    if text is None:
-        raise HTTPException(502, "LLM API error")
-
-    parsed = parse_json_object(text) or {}
-    translation_en = (parsed.get("translation_en") or "").strip()
-    translation_zh = (parsed.get("translation_zh") or "").strip()
-
-    if not translation_en and not translation_zh:
-        raise HTTPException(502, "Failed to generate quiz answer")
-    if not translation_en:
-        translation_en = translation_zh
-    if not translation_zh:
-        translation_zh = translation_en
+    qc_key = quiz_cache_key("translate", lang, gender, formality, sentence)
+    cached = quiz_cache_get(qc_key)
+    if cached is not None:
+        translation_en, translation_zh = cached["translation_en"], cached["translation_zh"]
+    else:
+        translation_en, translation_zh = await _quiz_translations(sentence, lang, lang_name, gender, formality)
+        quiz_cache_put(qc_key, {"translation_en": translation_en, "translation_zh": translation_zh})
 
     quiz_id = new_quiz_id(lang, sentence)
-    cleanup_quiz_answers()
-    quiz_answers[quiz_id] = {
+    store_quiz_answer(quiz_id, {
         "created_at": time.time(),
         "sentence": sentence,
         "language": lang,
-        "source": picked.get("source", ""),
+        "source": picked.source,
         "answer_en": translation_en,
         "answer_zh": translation_zh,
-    }
+    })
 
     return {
         "quiz_id": quiz_id,
         "sentence": sentence,
-        "source": picked.get("source", ""),
+        "source": picked.source,
         "language": lang,
         "hint": translation_hint(translation_en),
         "pronunciation": deterministic_pronunciation(sentence, lang),
     }
 
 
+_NON_WORD_RE = _re.compile(r"\W+")
+# One CJK character can be a whole answer (走, 對, 是), so the too-short shortcut skips these
+_CJK_RE = _re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af\uf900-\ufaff]")
+
+
+def _normalize_answer(text: str) -> str:
+    """Casefold and drop punctuation/whitespace for exact-match grading."""
+    return _NON_WORD_RE.sub("", text.casefold())
+
+
+async def _grade_quiz_answer(quiz: dict, answer: str) -> dict:
+    """Ask the LLM to grade a learner answer against a stored quiz."""
+    lang_name = SUPPORTED_LANGUAGES.get(quiz["language"], quiz["language"])
+
+    prompt = QUIZ_CHECK_TMPL.format_map({
+        "lang_name": lang_name, "sentence": quiz["sentence"], "answer_en": quiz["answer_en"],
+        "answer_zh": quiz["answer_zh"], "answer": answer,
+    })
+
+    text = await ollama_chat(
+        [{"role": "system", "content": QUIZ_CHECK_SYSTEM_MSG}, {"role": "user", "content": prompt}],
+        model=get_model_for_language(quiz["language"]), temperature=0.1, num_predict=196, timeout=60,
+        early_stop=json_object_complete,
+    )
+
+    if text is None:
+        raise HTTPException(502, "LLM API error")
+
+    parsed = parse_json_object(text) or {}
+    score = str(parsed.get("score", "")).strip().lower()
+    if score not in {"perfect", "good", "partial", "wrong"}:
+        score = "wrong"
+    feedback = str(parsed.get("feedback", "")).strip() or "Meaning does not match closely enough."
+    return {"score": score, "feedback": feedback}
+
+
 @router.post("/api/quiz-check", tags=["Quiz"], summary="Check a quiz answer")
 async def quiz_check(
     request: Request,
@@ -133,7 +202,6 @@ async def quiz_check(
 ):
 
     rate_key = get_rate_limit_key(request)
-    rate_limit_cleanup()
     if not rate_limit_check(rate_key):
         raise HTTPException(429, "Too many requests. Please wait a minute.")
 
@@ -151,41 +219,6 @@ async def quiz_check(
     if req.target_language != quiz.get("language"):
         raise HTTPException(400, "Quiz language mismatch")
 
-    lang_name = SUPPORTED_LANGUAGES.get(quiz["language"], quiz["language"])
-
-    prompt = f"""Evaluate whether the learner answer captures the MEANING of the target sentence.
-Do not require exact wording.
-
-Target sentence ({lang_name}): "{quiz['sentence']}"
-Reference English meaning: "{quiz['answer_en']}"
-Reference Traditional Chinese meaning: "{quiz['answer_zh']}"
-Learner answer: "{answer}"
-
-Scoring rubric:
-- perfect: meaning is fully accurate and complete
-- good: meaning is correct with minor wording differences
-- partial: some meaning is correct but key details are missing or off
-- wrong: meaning is mostly incorrect
-
-Return JSON only in this format:
-{{"score": "perfect|good|partial|wrong", "feedback": "brief explanation"}}"""
-
-    system_msg = "You are a translation quiz grader. Grade semantic equivalence only. Return strict JSON only."
-
-    text = await ollama_chat(
-        [{"role": "system", "content": system_msg}, {"role": "user", "content": prompt}],
-        model=get_model_for_language(quiz["language"]), temperature=0.1, num_predict=196, timeout=60
-    )
-
-    if text is None:
-        raise HTTPException(502, "LLM API error")
-
-    parsed = parse_json_object(text) or {}
-    score = str(parsed.get("score", "")).strip().lower()
-    if score not in {"perfect", "good", "partial", "wrong"}:
-        score = "wrong"
-    feedback = str(parsed.get("feedback", "")).strip() or "Meaning does not match closely enough."
-
     answer_en = quiz.get("answer_en", "").strip()
     answer_zh = quiz.get("answer_zh", "").strip()
     if answer_en and answer_zh and answer_zh != answer_en:
@@ -193,6 +226,23 @@ Return JSON only in this format:
     else:
         correct_answer = answer_en or answer_zh
 
+    # Grade exact matches and too-short answers without the LLM.
+    norm_answer = _normalize_answer(answer)
+    if norm_answer and norm_answer in (_normalize_answer(answer_en), _normalize_answer(answer_zh)):
+        return {"correct": True, "score": "perfect", "correct_answer": correct_answer, "feedback": "Exact match."}
+    if len(norm_answer) < 2 and not _CJK_RE.search(norm_answer):
+        return {"correct": False, "score": "wrong", "correct_answer": correct_answer, "feedback": "Answer is too short."}
+
+    qc_key = quiz_cache_key(
+        "check", quiz["language"], quiz["sentence"], quiz["answer_en"], quiz["answer_zh"],
+        " ".join(answer.lower().split()),
+    )
+    verdict = quiz_cache_get(qc_key)
+    if verdict is None:
+        verdict = await _grade_quiz_answer(quiz, answer)
+        quiz_cache_put(qc_key, verdict)
+    score, feedback = verdict["score"], verdict["feedback"]
+
     return {
         "correct": score in {"perfect", "good"},
         "score": score,
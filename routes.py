@@ -1,6 +1,8 @@
 """API route handlers for Sentsei."""
 import os
-import json
+import orjson
+import asyncio
+import sqlite3
 import re as _re
 import random
 import hashlib
@@ -14,6 +16,7 @@ from log import get_logger
 logger = get_logger("sentsei.routes")
 
 from fastapi import APIRouter, Depends, HTTPException, Header, Request, Response
+from fastapi.responses import StreamingResponse
 
 from models import (
     SUPPORTED_LANGUAGES, ALLOWED_DATA_KEYS,
@@ -23,11 +26,13 @@ from models import (
 )
 from cache import (
     cache_key, cache_get, cache_put,
-    get_grammar_patterns,
+    get_grammar_patterns, get_grammar_version, get_grammar_patterns_sorted_by_count,
     word_cache_key, word_cache_get, word_cache_put, word_cache_stats,
+    llm_cache_stats, quiz_cache_stats,
+    single_flight,
 )
 from auth import (
-    APP_PASSWORD, rate_limit_check, rate_limit_cleanup, get_rate_limit_key,
+    APP_PASSWORD, rate_limit_check, get_rate_limit_key,
     get_db, init_user_db, hash_password, verify_password,
     create_session, get_user_from_token, extract_bearer_token,
     require_password,
@@ -39,15 +44,14 @@ from llm import (
     llm_word_detail, parse_json_object,
     sanitize_tsv_cell, anki_language_label,
     get_model_for_language,
-    ollama_chat, check_ollama_connectivity,
+    ollama_chat, check_ollama_connectivity, json_object_complete,
+    _HAN_RE,
 )
 
 from surprise import (
     router as surprise_router,
-    _surprise_bank, _surprise_bank_filling,
-    increment_user_request, decrement_user_request,
-    load_surprise_bank, fill_surprise_bank_task, refill_surprise_bank_task,
-    save_surprise_bank, get_surprise_bank,
+    load_surprise_bank, surprise_bank_producer, is_surprise_bank_filling,
+    save_surprise_bank, get_surprise_bank, get_surprise_bank_total,
 )
 from feedback import router as feedback_router
 from quiz_routes import router as quiz_router
@@ -81,7 +85,6 @@ async def word_detail(
 ):
 
     rate_key = get_rate_limit_key(request)
-    rate_limit_cleanup()
     if not rate_limit_check(rate_key):
         raise HTTPException(429, "Too many requests. Please wait a minute.")
 
@@ -113,14 +116,59 @@ async def word_detail(
         return result
 
     # Fallback to LLM only when dictionary data is unavailable.
-    result = await llm_word_detail(req.word, req.meaning, req.target_language)
+    async def _generate():
+        result = await llm_word_detail(req.word, req.meaning, req.target_language)
+        if result is not None:
+            result = normalize_word_detail_payload(result)
+            word_cache_put(wc_key, result)
+        return result
+
+    result = await single_flight(wc_key, _generate)
     if result is None:
         raise HTTPException(502, "LLM API error")
-    result = normalize_word_detail_payload(result)
-    word_cache_put(wc_key, result)
     return result
 
 
+CTX_TMPL = """Given this {lang_name} sentence: "{translation}"
+(Original meaning: "{source_sentence}")
+
+Generate 3 different example sentences in {lang_name} that use the SAME key grammar pattern or vocabulary from the sentence above, but in DIFFERENT everyday contexts.
+
+Respond with ONLY valid JSON (no markdown, no code fences):
+{{
+  "examples": [
+    {{
+      "sentence": "example in {lang_name} script",
+      "pronunciation": "romanized pronunciation",
+      "meaning": "translation in {explain_lang}",
+      "context": "brief label like 'At a restaurant' or 'Texting a friend' in {explain_lang}"
+    }}
+  ]
+}}
+
+Rules:
+- Each example should show a DIFFERENT situation/context
+- Keep sentences simple and practical (beginner-friendly)
+- Use the same grammar structure but with different vocabulary
+- All meanings/context labels in {explain_lang}"""
+
+_CTX_SYSTEM = {
+    code: f"You are a {name} teacher creating contextual examples. Respond with valid JSON only."
+    for code, name in SUPPORTED_LANGUAGES.items()
+}
+
+# Translations shorter than this are used verbatim in the cache key instead of hashed
+CONTEXT_KEY_HASH_MIN_LEN = 128
+
+
+def context_examples_cache_key(translation: str, target_language: str) -> str:
+    # Keys must stay strings: the translation cache is persisted as a JSON object.
+    if len(translation) < CONTEXT_KEY_HASH_MIN_LEN:
+        return f"ctx:{target_language}:{translation}"
+    digest = hashlib.blake2b(translation.encode(), digest_size=8, key=target_language.encode()[:16])
+    return f"ctx:{digest.hexdigest()}"
+
+
 @router.post("/api/context-examples", tags=["Learning"], summary="Get example sentences using a word")
 async def context_examples(
     request: Request,
@@ -129,7 +177,6 @@ async def context_examples(
 ):
 
     rate_key = get_rate_limit_key(request)
-    rate_limit_cleanup()
     if not rate_limit_check(rate_key):
         raise HTTPException(429, "Too many requests. Please wait a minute.")
 
@@ -140,67 +187,86 @@ async def context_examples(
         raise HTTPException(400, "Unsupported language")
 
     lang_name = SUPPORTED_LANGUAGES[req.target_language]
-    input_is_chinese = any('\u4e00' <= c <= '\u9fff' for c in req.source_sentence)
+    input_is_chinese = _HAN_RE.search(req.source_sentence) is not None
     explain_lang = "繁體中文" if input_is_chinese else "English"
 
-    ck = f"ctx:{hashlib.md5((req.translation + req.target_language).encode()).hexdigest()}"
+    ck = context_examples_cache_key(req.translation, req.target_language)
     cached = cache_get(ck)
     if cached:
         return cached
 
-    prompt = f"""Given this {lang_name} sentence: "{req.translation}"
-(Original meaning: "{req.source_sentence}")
+    async def _generate():
+        prompt = CTX_TMPL.format_map({
+            "lang_name": lang_name, "translation": req.translation,
+            "source_sentence": req.source_sentence, "explain_lang": explain_lang,
+        })
+        system_msg = _CTX_SYSTEM[req.target_language]
 
-Generate 3 different example sentences in {lang_name} that use the SAME key grammar pattern or vocabulary from the sentence above, but in DIFFERENT everyday contexts.
+        text = await ollama_chat(
+            [{"role": "system", "content": system_msg}, {"role": "user", "content": prompt}],
+            model=get_model_for_language(req.target_language), temperature=0.5, num_predict=1024, timeout=120,
+            early_stop=json_object_complete,
+        )
 
-Respond with ONLY valid JSON (no markdown, no code fences):
-{{
-  "examples": [
-    {{
-      "sentence": "example in {lang_name} script",
-      "pronunciation": "romanized pronunciation",
-      "meaning": "translation in {explain_lang}",
-      "context": "brief label like 'At a restaurant' or 'Texting a friend' in {explain_lang}"
-    }}
-  ]
-}}
+        if text is None:
+            raise HTTPException(502, "LLM API error")
 
-Rules:
-- Each example should show a DIFFERENT situation/context
-- Keep sentences simple and practical (beginner-friendly)
-- Use the same grammar structure but with different vocabulary
-- All meanings/context labels in {explain_lang}"""
+        result = parse_json_object(text)
+        if not result:
+            return {"examples": []}
 
-    system_msg = f"You are a {lang_name} teacher creating contextual examples. Respond with valid JSON only."
+        result = ensure_traditional_chinese(result)
 
-    text = await ollama_chat(
-        [{"role": "system", "content": system_msg}, {"role": "user", "content": prompt}],
-        model=get_model_for_language(req.target_language), temperature=0.5, num_predict=1024, timeout=120
-    )
+        if "examples" in result:
+            for ex in result["examples"]:
+                if "sentence" in ex and req.target_language in ("ja", "zh", "ko"):
+                    det = deterministic_pronunciation(ex["sentence"], req.target_language)
+                    if det:
+                        ex["pronunciation"] = det
 
-    if text is None:
-        raise HTTPException(502, "LLM API error")
+        cache_put(ck, result)
+        return result
 
-    result = parse_json_object(text)
-    if not result:
-        return {"examples": []}
+    return await single_flight(ck, _generate)
 
-    result = ensure_traditional_chinese(result)
 
-    if "examples" in result:
-        for ex in result["examples"]:
-            if "sentence" in ex and req.target_language in ("ja", "zh", "ko"):
-                det = deterministic_pronunciation(ex["sentence"], req.target_language)
-                if det:
-                    ex["pronunciation"] = det
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
 
-    cache_put(ck, result)
-    return result
+
+_LANGUAGES_BODY = orjson.dumps(dict(SUPPORTED_LANGUAGES))
+_LANGUAGES_ETAG = _etag(_LANGUAGES_BODY)
+# STORIES is a read-only mapping, so its summary list never changes.
+_STORIES_SUMMARY = tuple(
+    {"id": s["id"], "title": s["title"], "source": s["source"], "language": s["language"], "sentence_count": len(s["sentences"])}
+    for s in STORIES.values()
+)
+_STORIES_SUMMARY_BODY = orjson.dumps(_STORIES_SUMMARY)
+_STORIES_ETAG = _etag(_STORIES_SUMMARY_BODY)
+_STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+
+# The grammar version counter restarts at 0 with the process; this nonce keeps
+# an ETag from an earlier process from matching different patterns after a restart.
+_GRAMMAR_ETAG_NONCE = os.urandom(6).hex()
+
+
+def _not_modified(request: Request, etag: str, cache_control: str) -> Optional[Response]:
+    """Return a 304 response if the client already holds *etag*."""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return None
 
 
 @router.get("/api/languages", tags=["Reference"], summary="List supported languages")
-async def get_languages():
-    return SUPPORTED_LANGUAGES
+async def get_languages(request: Request):
+    not_modified = _not_modified(request, _LANGUAGES_ETAG, _STATIC_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+    return Response(
+        content=_LANGUAGES_BODY, media_type="application/json",
+        headers={"ETag": _LANGUAGES_ETAG, "Cache-Control": _STATIC_CACHE_CONTROL},
+    )
 
 
 @router.post("/api/export-anki", tags=["Export"], summary="Export history as Anki TSV")
@@ -209,27 +275,26 @@ async def export_anki(
     _pw=Depends(require_password),
 ):
 
-    rows: List[str] = []
-    for entry in entries:
-        front = sanitize_tsv_cell(entry.sentence)
-        if not front:
-            continue
-        translation = sanitize_tsv_cell(entry.translation)
-        pronunciation = sanitize_tsv_cell(entry.pronunciation)
-        lang_code = (entry.target or entry.lang or "").strip()
-        back_parts: List[str] = []
-        if translation:
-            back_parts.append(translation)
-        if pronunciation:
-            back_parts.append(f"Pronunciation: {pronunciation}")
-        if lang_code:
-            back_parts.append(f"Language: {anki_language_label(lang_code)}")
-        back = sanitize_tsv_cell("<br>".join(back_parts))
-        rows.append(f"{front}\t{back}")
-
-    content = "\n".join(rows)
+    async def _rows():
+        for entry in entries:
+            front = sanitize_tsv_cell(entry.sentence)
+            if not front:
+                continue
+            translation = sanitize_tsv_cell(entry.translation)
+            pronunciation = sanitize_tsv_cell(entry.pronunciation)
+            lang_code = (entry.target or entry.lang or "").strip()
+            back_parts: List[str] = []
+            if translation:
+                back_parts.append(translation)
+            if pronunciation:
+                back_parts.append(f"Pronunciation: {pronunciation}")
+            if lang_code:
+                back_parts.append(f"Language: {anki_language_label(lang_code)}")
+            back = sanitize_tsv_cell("<br>".join(back_parts))
+            yield (front + "\t" + back + "\n").encode("utf-8")
+
     headers = {"Content-Disposition": 'attachment; filename="sent-say-flashcards.txt"'}
-    return Response(content=content, media_type="text/tab-separated-values", headers=headers)
+    return StreamingResponse(_rows(), media_type="text/tab-separated-values", headers=headers)
 
 
 @router.get("/api/health", tags=["System"], summary="Health check with stats")
@@ -237,8 +302,8 @@ async def health_check():
     from cache import _translation_cache, CACHE_MAX, CACHE_TTL
     ollama_ok = await check_ollama_connectivity()
     cache_size = len(_translation_cache)
-    bank_total = sum(len(v) for v in _surprise_bank.values())
-    bank_langs = len(_surprise_bank)
+    bank_total = get_surprise_bank_total()
+    bank_langs = len(get_surprise_bank())
 
     from backend import get_latency_stats
     return {
@@ -246,17 +311,22 @@ async def health_check():
         "ollama": {"reachable": ollama_ok, "url": OLLAMA_URL, "model": OLLAMA_MODEL},
         "cache": {"entries": cache_size, "max": CACHE_MAX, "ttl_hours": CACHE_TTL / 3600},
         "word_cache": word_cache_stats(),
-        "surprise_bank": {"total_entries": bank_total, "languages": bank_langs, "filling": _surprise_bank_filling},
+        "llm_cache": llm_cache_stats(),
+        "quiz_cache": quiz_cache_stats(),
+        "surprise_bank": {"total_entries": bank_total, "languages": bank_langs, "filling": is_surprise_bank_filling()},
         "latency": get_latency_stats(),
     }
 
 
 @router.get("/api/stories", tags=["Stories"], summary="List available stories")
-async def list_stories():
-    return [
-        {"id": s["id"], "title": s["title"], "source": s["source"], "language": s["language"], "sentence_count": len(s["sentences"])}
-        for s in STORIES.values()
-    ]
+async def list_stories(request: Request):
+    not_modified = _not_modified(request, _STORIES_ETAG, _STATIC_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+    return Response(
+        content=_STORIES_SUMMARY_BODY, media_type="application/json",
+        headers={"ETag": _STORIES_ETAG, "Cache-Control": _STATIC_CACHE_CONTROL},
+    )
 
 
 @router.get("/api/story/{story_id}", tags=["Stories"], summary="Get a specific story")
@@ -268,11 +338,22 @@ async def get_story(story_id: str):
 
 
 @router.get("/api/grammar-patterns", tags=["Reference"], summary="Browse grammar patterns")
-async def list_grammar_patterns(lang: Optional[str] = None, _pw=Depends(require_password)):
-    patterns = list(get_grammar_patterns().values())
+async def list_grammar_patterns(
+    request: Request,
+    response: Response,
+    lang: Optional[str] = None,
+    _pw=Depends(require_password),
+):
+    # Patterns grow as sentences are learned, so clients must revalidate each time.
+    etag = f'"gp-{_GRAMMAR_ETAG_NONCE}-{get_grammar_version()}-{lang or ""}"'
+    not_modified = _not_modified(request, etag, "private, no-cache")
+    if not_modified:
+        return not_modified
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    patterns = get_grammar_patterns_sorted_by_count()
     if lang:
         patterns = [p for p in patterns if p.get("lang") == lang]
-    patterns.sort(key=lambda p: -p.get("count", 0))
     return [
         {"id": p["id"], "name": p["name"], "lang": p["lang"], "explanation": p["explanation"], "count": p["count"], "example_count": len(p.get("examples", []))}
         for p in patterns
@@ -304,18 +385,19 @@ async def auth_register(req: AuthRequest):
     conn = get_db()
     existing = conn.execute("SELECT id FROM users WHERE username = ?", (username,)).fetchone()
     if existing:
-        conn.close()
         raise HTTPException(409, "Username already taken")
 
-    pw_hash = hash_password(password)
+    # bcrypt is ~100 ms of CPU; keep it off the event loop.
+    pw_hash = await asyncio.to_thread(hash_password, password)
     now = time.time()
-    cursor = conn.execute("INSERT INTO users (username, password_hash, created_at) VALUES (?, ?, ?)",
-                          (username, pw_hash, now))
-    user_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-
-    token = create_session(user_id)
+    try:
+        with conn:
+            cursor = conn.execute("INSERT INTO users (username, password_hash, created_at) VALUES (?, ?, ?)",
+                                  (username, pw_hash, now))
+            token = create_session(cursor.lastrowid, conn)
+    except sqlite3.IntegrityError:
+        # Lost a race with a concurrent registration while hashing.
+        raise HTTPException(409, "Username already taken")
     return {"token": token, "username": username}
 
 
@@ -324,18 +406,17 @@ async def auth_login(req: AuthRequest):
     username = req.username.strip()
     conn = get_db()
     row = conn.execute("SELECT id, password_hash FROM users WHERE username = ?", (username,)).fetchone()
-    conn.close()
-    if not row or not verify_password(req.password, row["password_hash"]):
+    if not row or not await asyncio.to_thread(verify_password, req.password, row["password_hash"]):
         raise HTTPException(401, "Invalid username or password")
 
+    # Rehash legacy passwords and open the session in one transaction.
+    new_hash = None
     if not row["password_hash"].startswith("$2b$"):
-        new_hash = hash_password(req.password)
-        conn2 = get_db()
-        conn2.execute("UPDATE users SET password_hash = ? WHERE id = ?", (new_hash, row["id"]))
-        conn2.commit()
-        conn2.close()
-
-    token = create_session(row["id"])
+        new_hash = await asyncio.to_thread(hash_password, req.password)
+    with conn:
+        if new_hash:
+            conn.execute("UPDATE users SET password_hash = ? WHERE id = ?", (new_hash, row["id"]))
+        token = create_session(row["id"], conn)
     return {"token": token, "username": username}
 
 
@@ -344,9 +425,8 @@ async def auth_logout(authorization: Optional[str] = Header(default=None)):
     token = extract_bearer_token(authorization)
     if token:
         conn = get_db()
-        conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
-        conn.commit()
-        conn.close()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
     return {"ok": True}
 
 
@@ -371,10 +451,9 @@ async def get_user_data(key: str, authorization: Optional[str] = Header(default=
     conn = get_db()
     row = conn.execute("SELECT data_json FROM user_data WHERE user_id = ? AND data_key = ?",
                        (user["id"], key)).fetchone()
-    conn.close()
     if not row:
         return {"key": key, "data": None}
-    return {"key": key, "data": json.loads(row["data_json"])}
+    return {"key": key, "data": orjson.loads(row["data_json"])}
 
 
 @router.put("/api/user-data/{key}")
@@ -386,21 +465,25 @@ async def put_user_data(key: str, request: Request, authorization: Optional[str]
     if not user:
         raise HTTPException(401, "Not logged in")
 
-    body = await request.json()
-    data = body.get("data")
-    data_json = json.dumps(data, ensure_ascii=False)
+    try:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(400, "Invalid JSON")
+    if not isinstance(body, dict):
+        raise HTTPException(400, "Body must be a JSON object")
+    data_json = orjson.dumps(body.get("data"))
 
     if len(data_json) > 1_000_000:
         raise HTTPException(400, "Data too large (max 1MB)")
+    data_json = data_json.decode()
 
     conn = get_db()
-    conn.execute(
-        "INSERT INTO user_data (user_id, data_key, data_json, updated_at) VALUES (?, ?, ?, ?) "
-        "ON CONFLICT(user_id, data_key) DO UPDATE SET data_json = excluded.data_json, updated_at = excluded.updated_at",
-        (user["id"], key, data_json, time.time())
-    )
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(
+            "INSERT INTO user_data (user_id, data_key, data_json, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(user_id, data_key) DO UPDATE SET data_json = excluded.data_json, updated_at = excluded.updated_at",
+            (user["id"], key, data_json, time.time())
+        )
     return {"ok": True}
 
 
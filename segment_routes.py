@@ -1,4 +1,5 @@
 """Segment and breakdown API route handlers for Sentsei."""
+import asyncio
 import re as _re
 
 from log import get_logger
@@ -9,18 +10,68 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 
 from models import SUPPORTED_LANGUAGES, BreakdownRequest
 from cache import cache_key, cache_get
-from auth import rate_limit_check, rate_limit_cleanup, get_rate_limit_key, require_password
+from auth import rate_limit_check, get_rate_limit_key, require_password
 from llm import (
     OLLAMA_MODEL,
-    deterministic_pronunciation, deterministic_word_pronunciation,
-    ensure_traditional_chinese, cedict_lookup, parse_json_object,
-    ollama_chat, get_model_for_language,
+    deterministic_pronunciation, deterministic_word_pronunciation, apply_word_pronunciations,
+    ensure_traditional_chinese, cedict_lookup, parse_json_object, get_jieba,
+    ZH_PUNCT_TABLE, jieba_words,
+    ollama_chat, json_object_complete, get_model_for_language,
 )
-from learn_routes import MAX_INPUT_LEN, _detect_input_language
+from learn_routes import MAX_INPUT_LEN, _learn_context, _words_in_translation
 
 router = APIRouter()
 
 
+BREAKDOWN_TMPL = """Break down this {lang_name} translation word by word.
+
+Original: "{sentence}"
+Translation: "{translation}"
+
+Return ONLY valid JSON:
+{{
+  "breakdown": [
+    {{"word": "each word from the translation", "pronunciation": "romanized", "meaning": "meaning in {source_lang_short}", "difficulty": "easy|medium|hard", "note": "brief grammar note in {source_lang_short} or null"}}
+  ],
+  "grammar_notes": ["1-3 key grammar patterns in {source_lang_short}"],
+  "cultural_note": "optional cultural context in {source_lang_short}, or null",
+  "alternative": "alternative phrasing with pronunciation. Format: 'sentence | PRONUNCIATION'. Null if none"
+}}
+
+Rules:
+- Break down ONLY words that appear in the translation
+- All explanations in {source_lang_short}"""
+
+_BREAKDOWN_SYSTEM = {
+    code: f"You are a {name} grammar teacher. Return valid JSON only."
+    for code, name in SUPPORTED_LANGUAGES.items()
+}
+
+
+def _segment_zh(translation: str) -> list:
+    """Segment a Chinese translation with jieba and gloss each word from cedict."""
+    jieba = get_jieba()
+    # Strip punctuation for segmentation
+    clean = translation.translate(ZH_PUNCT_TABLE)
+    words = [w.strip() for w in jieba.cut(clean) if w.strip()]
+    breakdown = []
+    for w in words:
+        pron = deterministic_word_pronunciation(w, "zh") or ""
+        meaning = cedict_lookup(w)
+        if not meaning:
+            chars = [cedict_lookup(c) or "" for c in w]
+            combined = " + ".join(c for c in chars if c)
+            meaning = combined if combined else ""
+        breakdown.append({
+            "word": w,
+            "pronunciation": pron,
+            "meaning": meaning,
+            "difficulty": "medium",
+            "note": None
+        })
+    return breakdown
+
+
 @router.post("/api/segment", tags=["Learning"], summary="Segment text into sentences")
 async def segment_sentence(
     request: Request,
@@ -39,25 +90,8 @@ async def segment_sentence(
     translation = req.translation or ""
 
     if lang_code == "zh" and translation:
-        import jieba
-        # Strip punctuation for segmentation
-        clean = translation.replace("，", "").replace("。", "").replace("！", "").replace("？", "").replace("、", "").replace("「", "").replace("」", "").replace("…", "")
-        words = [w.strip() for w in jieba.cut(clean) if w.strip()]
-        breakdown = []
-        for w in words:
-            pron = deterministic_word_pronunciation(w, lang_code) or ""
-            meaning = cedict_lookup(w)
-            if not meaning:
-                chars = [cedict_lookup(c) or "" for c in w]
-                combined = " + ".join(c for c in chars if c)
-                meaning = combined if combined else ""
-            breakdown.append({
-                "word": w,
-                "pronunciation": pron,
-                "meaning": meaning,
-                "difficulty": "medium",
-                "note": None
-            })
+        # jieba and the cedict lookups are CPU-bound; keep them off the event loop
+        breakdown = await asyncio.to_thread(_segment_zh, translation)
         return {"breakdown": breakdown, "source": "jieba+cedict"}
     elif lang_code in ("ja", "ko") and translation:
         words = translation.split() if lang_code == "ko" else [translation]
@@ -90,7 +124,6 @@ async def get_breakdown(
 ):
 
     rate_key = get_rate_limit_key(request)
-    rate_limit_cleanup()
     if not rate_limit_check(rate_key):
         raise HTTPException(429, "Too many requests. Please wait a minute.")
 
@@ -100,35 +133,18 @@ async def get_breakdown(
     if req.target_language not in SUPPORTED_LANGUAGES:
         raise HTTPException(400, "Unsupported language")
 
-    lang_name = SUPPORTED_LANGUAGES[req.target_language]
-    lang_code = req.target_language
-    input_is_chinese = _detect_input_language(req.sentence, getattr(req, 'input_language', 'auto') or 'auto')
-    source_lang_short = "繁體中文" if input_is_chinese else "English"
-
-    prompt = f"""Break down this {lang_name} translation word by word.
-
-Original: "{req.sentence}"
-Translation: "{req.translation}"
-
-Return ONLY valid JSON:
-{{
-  "breakdown": [
-    {{"word": "each word from the translation", "pronunciation": "romanized", "meaning": "meaning in {source_lang_short}", "difficulty": "easy|medium|hard", "note": "brief grammar note in {source_lang_short} or null"}}
-  ],
-  "grammar_notes": ["1-3 key grammar patterns in {source_lang_short}"],
-  "cultural_note": "optional cultural context in {source_lang_short}, or null",
-  "alternative": "alternative phrasing with pronunciation. Format: 'sentence | PRONUNCIATION'. Null if none"
-}}
-
-Rules:
-- Break down ONLY words that appear in the translation
-- All explanations in {source_lang_short}"""
+    lang_code, lang_name, input_is_chinese, source_lang_short = _learn_context(req)
 
-    system_msg = f"You are a {lang_name} grammar teacher. Return valid JSON only."
+    prompt = BREAKDOWN_TMPL.format_map({
+        "lang_name": lang_name, "sentence": req.sentence,
+        "translation": req.translation, "source_lang_short": source_lang_short,
+    })
+    system_msg = _BREAKDOWN_SYSTEM[lang_code]
 
     text = await ollama_chat(
         [{"role": "system", "content": system_msg}, {"role": "user", "content": prompt}],
-        model=get_model_for_language(lang_code), temperature=0.3, num_predict=1024, timeout=60
+        model=get_model_for_language(lang_code), temperature=0.3, num_predict=1024, timeout=60,
+        early_stop=json_object_complete,
     )
 
     if text is None:
@@ -138,19 +154,13 @@ Rules:
     if not result:
         raise HTTPException(502, "Failed to parse breakdown response")
 
-    for item in result.get("breakdown", []):
-        word = item.get("word", "")
-        word_pron = deterministic_word_pronunciation(word, lang_code)
-        if word_pron:
-            item["pronunciation"] = word_pron
+    apply_word_pronunciations(result.get("breakdown", []), lang_code)
 
     breakdown = result.get("breakdown", [])
     if lang_code == "zh" and breakdown and req.translation:
         avg_word_len = sum(len(item.get("word", "")) for item in breakdown) / max(len(breakdown), 1)
         if avg_word_len <= 1.2 and len(breakdown) > 3:
-            import jieba
-            words = list(jieba.cut(req.translation.replace("，", "").replace("。", "").replace("！", "").replace("？", "")))
-            words = [w.strip() for w in words if w.strip()]
+            words = await asyncio.to_thread(jieba_words, req.translation)
             new_breakdown = []
             for w in words:
                 pron = deterministic_word_pronunciation(w, lang_code) or ""
@@ -160,8 +170,7 @@ Rules:
             breakdown = new_breakdown
 
     if breakdown and req.translation:
-        clean_translation = req.translation.replace(" ", "").replace("，", "").replace(",", "").replace("。", "").replace(".", "").replace("！", "").replace("!", "").replace("？", "").replace("?", "")
-        result["breakdown"] = [item for item in breakdown if item.get("word", "").replace(" ", "") in clean_translation]
+        result["breakdown"] = _words_in_translation(breakdown, req.translation)
 
     result = ensure_traditional_chinese(result)
     return result
@@ -1,15 +1,22 @@
-"""Dedicated SRS API routes backed by user_data.srs_deck."""
-import json
-import time
+"""Dedicated SRS API routes backed by the srs_items table."""
 from typing import Optional, Any, Dict, List
 
+import orjson
 from fastapi import APIRouter, Header, HTTPException
 from pydantic import BaseModel
 
-from auth import extract_bearer_token, get_user_from_token, get_db
+from auth import (
+    extract_bearer_token, get_user_from_token, get_db,
+    SRS_ITEM_FIELDS, UPSERT_SRS_ITEM_SQL, srs_item_row,
+)
 
 router = APIRouter()
 
+# Same bounds the old single-blob deck had (1MB of JSON), plus an item cap
+# since each item is now its own row
+SRS_DECK_MAX_BYTES = 1_000_000
+SRS_DECK_MAX_ITEMS = 5000
+
 
 class SRSItemPayload(BaseModel):
     sentence: str
@@ -40,53 +47,46 @@ def _require_user(authorization: Optional[str]) -> Dict[str, Any]:
     return user
 
 
+_SELECT_SRS_DECK_SQL = (
+    "SELECT " + ", ".join(col for _, col in SRS_ITEM_FIELDS) + ", extra FROM srs_items "
+    "WHERE user_id = ? ORDER BY position, rowid"
+)
+
+
 def _load_srs_deck(conn, user_id: int) -> List[Dict[str, Any]]:
-    row = conn.execute(
-        "SELECT data_json FROM user_data WHERE user_id = ? AND data_key = 'srs_deck'",
-        (user_id,),
-    ).fetchone()
-    if not row:
-        return []
-    try:
-        parsed = json.loads(row["data_json"])
-    except Exception:
-        return []
-    return parsed if isinstance(parsed, list) else []
-
-
-def _save_srs_deck(conn, user_id: int, deck: List[Dict[str, Any]]) -> None:
-    data_json = json.dumps(deck, ensure_ascii=False)
-    if len(data_json) > 1_000_000:
-        raise HTTPException(400, "Data too large (max 1MB)")
-    conn.execute(
-        "INSERT INTO user_data (user_id, data_key, data_json, updated_at) VALUES (?, 'srs_deck', ?, ?) "
-        "ON CONFLICT(user_id, data_key) DO UPDATE SET data_json = excluded.data_json, updated_at = excluded.updated_at",
-        (user_id, data_json, time.time()),
-    )
+    # Items come back in deck order: PUT stores each at its index and
+    # /api/srs/item appends. Keys kept in the extra JSON are restored, with
+    # the columns (which /api/srs/review updates) taking precedence.
+    deck = []
+    for row in conn.execute(_SELECT_SRS_DECK_SQL, (user_id,)):
+        item = orjson.loads(row["extra"]) if row["extra"] else {}
+        item.update({key: row[col] for key, col in SRS_ITEM_FIELDS if row[col] is not None})
+        deck.append(item)
+    return deck
 
 
 @router.get("/api/srs/deck", tags=["SRS"], summary="Get full SRS deck for current user")
 async def get_srs_deck(authorization: Optional[str] = Header(default=None)):
     user = _require_user(authorization)
-    conn = get_db()
-    try:
-        return _load_srs_deck(conn, user["id"])
-    finally:
-        conn.close()
+    return _load_srs_deck(get_db(), user["id"])
 
 
 @router.put("/api/srs/deck", tags=["SRS"], summary="Replace full SRS deck for current user")
 async def put_srs_deck(deck: List[Dict[str, Any]], authorization: Optional[str] = Header(default=None)):
     if not all(isinstance(item, dict) for item in deck):
         raise HTTPException(400, "Deck must be an array of objects")
+    if len(deck) > SRS_DECK_MAX_ITEMS:
+        raise HTTPException(400, f"Deck too large (max {SRS_DECK_MAX_ITEMS} items)")
+    if len(orjson.dumps(deck)) > SRS_DECK_MAX_BYTES:
+        raise HTTPException(400, "Data too large (max 1MB)")
     user = _require_user(authorization)
     conn = get_db()
-    try:
-        _save_srs_deck(conn, user["id"], deck)
-        conn.commit()
-        return {"ok": True, "count": len(deck)}
-    finally:
-        conn.close()
+    with conn:
+        conn.execute("DELETE FROM srs_items WHERE user_id = ?", (user["id"],))
+        conn.executemany(UPSERT_SRS_ITEM_SQL, [srs_item_row(user["id"], item, i) for i, item in enumerate(deck)])
+        # Items sharing a (sentence, lang) were merged by the upsert
+        count = conn.execute("SELECT COUNT(*) FROM srs_items WHERE user_id = ?", (user["id"],)).fetchone()[0]
+        return {"ok": True, "count": count}
 
 
 @router.post("/api/srs/item", tags=["SRS"], summary="Add one item to the SRS deck")
@@ -94,22 +94,20 @@ async def add_srs_item(item: SRSItemPayload, authorization: Optional[str] = Head
     user = _require_user(authorization)
     item_data = item.model_dump(exclude_none=True)
     conn = get_db()
-    try:
-        deck = _load_srs_deck(conn, user["id"])
-        item_key = (item_data.get("sentence"), item_data.get("lang"))
-        updated = False
-        for idx, existing in enumerate(deck):
-            if (existing.get("sentence"), existing.get("lang")) == item_key:
-                deck[idx] = {**existing, **item_data}
-                updated = True
-                break
-        if not updated:
-            deck.append(item_data)
-        _save_srs_deck(conn, user["id"], deck)
-        conn.commit()
-        return {"ok": True, "added": not updated, "count": len(deck)}
-    finally:
-        conn.close()
+    with conn:
+        existed = conn.execute(
+            "SELECT 1 FROM srs_items WHERE user_id = ? AND sentence = ? AND lang = ?",
+            (user["id"], item.sentence, item.lang),
+        ).fetchone() is not None
+        count, position = conn.execute(
+            "SELECT COUNT(*), COALESCE(MAX(position), -1) + 1 FROM srs_items WHERE user_id = ?", (user["id"],),
+        ).fetchone()
+        if not existed:
+            if count >= SRS_DECK_MAX_ITEMS:
+                raise HTTPException(400, f"Deck too large (max {SRS_DECK_MAX_ITEMS} items)")
+            count += 1
+        conn.execute(UPSERT_SRS_ITEM_SQL, srs_item_row(user["id"], item_data, position))
+        return {"ok": True, "added": not existed, "count": count}
 
 
 @router.delete("/api/srs/item", tags=["SRS"], summary="Remove one SRS item by sentence+lang")
@@ -120,33 +118,25 @@ async def remove_srs_item(
 ):
     user = _require_user(authorization)
     conn = get_db()
-    try:
-        deck = _load_srs_deck(conn, user["id"])
-        filtered = [item for item in deck if not (item.get("sentence") == sentence and item.get("lang") == lang)]
-        _save_srs_deck(conn, user["id"], filtered)
-        conn.commit()
-        return {"ok": True, "removed": len(filtered) != len(deck), "count": len(filtered)}
-    finally:
-        conn.close()
+    with conn:
+        removed = conn.execute(
+            "DELETE FROM srs_items WHERE user_id = ? AND sentence = ? AND lang = ?",
+            (user["id"], sentence, lang),
+        ).rowcount
+        count = conn.execute("SELECT COUNT(*) FROM srs_items WHERE user_id = ?", (user["id"],)).fetchone()[0]
+        return {"ok": True, "removed": removed > 0, "count": count}
 
 
 @router.post("/api/srs/review", tags=["SRS"], summary="Persist updated review fields for one item")
 async def review_srs_item(req: SRSReviewPayload, authorization: Optional[str] = Header(default=None)):
     user = _require_user(authorization)
     conn = get_db()
-    try:
-        deck = _load_srs_deck(conn, user["id"])
-        target = next((item for item in deck if item.get("sentence") == req.sentence and item.get("lang") == req.lang), None)
-        if not target:
+    with conn:
+        updated = conn.execute(
+            "UPDATE srs_items SET interval = ?, ease_factor = ?, next_review = ?, review_count = ? "
+            "WHERE user_id = ? AND sentence = ? AND lang = ?",
+            (req.interval, req.easeFactor, req.nextReview, req.reviewCount, user["id"], req.sentence, req.lang),
+        ).rowcount
+        if not updated:
             raise HTTPException(404, "SRS item not found")
-
-        target["interval"] = req.interval
-        target["easeFactor"] = req.easeFactor
-        target["nextReview"] = req.nextReview
-        target["reviewCount"] = req.reviewCount
-
-        _save_srs_deck(conn, user["id"], deck)
-        conn.commit()
         return {"ok": True}
-    finally:
-        conn.close()
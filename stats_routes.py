@@ -1,22 +1,15 @@
 """Aggregate usage stats endpoint."""
-import sqlite3
 import time
 from collections import Counter
-from pathlib import Path
 
 from fastapi import APIRouter, Depends
-from auth import require_password
-from cache import _translation_cache, word_cache_stats
+from auth import require_password, get_db
+from cache import _translation_cache, CACHE_TTL, word_cache_stats
 
 router = APIRouter(prefix="/api", tags=["stats"])
 
-DB_PATH = Path(__file__).parent / "sentsei.db"
-
-
-def _db():
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+STATS_TTL = 5  # seconds; dashboards poll this, and the numbers barely move between polls
+_stats_cache = {"t": 0.0, "v": None}
 
 
 @router.get("/stats")
@@ -24,12 +17,17 @@ async def get_stats(_pw=Depends(require_password)):
     """Aggregate usage stats: cache, users, latency."""
     from backend import get_latency_stats
 
-    # Translation cache stats
+    # Nothing below awaits, so concurrent pollers can't rebuild it at the same time
     now = time.time()
+    if _stats_cache["v"] is not None and now - _stats_cache["t"] < STATS_TTL:
+        return _stats_cache["v"]
+
+    # Translation cache stats
     lang_counter = Counter()
     valid = 0
-    for _key, (ts, result) in list(_translation_cache.items()):
-        if now - ts < 86400:  # within TTL
+    # Iterated in place: this handler never awaits, so nothing can mutate the cache mid-loop
+    for ts, result in _translation_cache.values():
+        if now - ts < CACHE_TTL:
             valid += 1
             lang = result.get("target_language", "unknown") if isinstance(result, dict) else "unknown"
             lang_counter[lang] += 1
@@ -43,12 +41,11 @@ async def get_stats(_pw=Depends(require_password)):
     # User stats from SQLite
     user_info = {"total_users": 0, "active_sessions": 0}
     try:
-        db = _db()
+        db = get_db()
         user_info["total_users"] = db.execute("SELECT COUNT(*) FROM users").fetchone()[0]
         user_info["active_sessions"] = db.execute(
-            "SELECT COUNT(*) FROM sessions WHERE expires_at > datetime('now')"
+            "SELECT COUNT(*) FROM sessions WHERE expires_at > ?", (now,)
         ).fetchone()[0]
-        db.close()
     except Exception:
         pass
 
@@ -58,9 +55,11 @@ async def get_stats(_pw=Depends(require_password)):
     # Latency
     latency = get_latency_stats()
 
-    return {
+    result = {
         "cache": cache_info,
         "users": user_info,
         "word_cache": wcache,
         "latency": latency,
     }
+    _stats_cache.update(t=now, v=result)
+    return result
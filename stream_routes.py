@@ -1,6 +1,7 @@
 """Streaming-related API route handlers for Sentsei."""
-import json
+import time
 import asyncio
+from contextlib import aclosing
 
 from log import get_logger
 
@@ -8,22 +9,69 @@ logger = get_logger("sentsei.stream_routes")
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
+import httpx
+import orjson
 
 from models import SentenceRequest, MultiSentenceRequest, WordDetailRequest, SUPPORTED_LANGUAGES
-from cache import cache_key, cache_get, word_cache_key, word_cache_get, word_cache_put
-from auth import rate_limit_check, rate_limit_cleanup, get_rate_limit_key, require_password
+from cache import (
+    cache_key, cache_get_frame, word_cache_key, word_cache_get, word_cache_put,
+    in_flight_wait, in_flight_begin, in_flight_end,
+)
+from auth import rate_limit_check, get_rate_limit_key, require_password
 from llm import (
     split_sentences,
     build_dictionary_word_detail,
     normalize_word_detail_payload,
-    llm_word_detail,
+    word_detail_messages, parse_word_detail, json_object_complete,
+    ollama_chat_stream, ollama_progress, get_model_for_language,
 )
-from surprise import increment_user_request, decrement_user_request
 from learn_routes import _learn_sentence_impl, MAX_INPUT_LEN
 
 router = APIRouter()
 
 
+def _sse_event(payload: dict) -> bytes:
+    """Encode one server-sent event frame."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+# Fixed frames are encoded once; learn-stream progress only varies in its token count
+_LEARN_PROGRESS_PREFIX = b'data: {"type":"progress","tokens":'
+_LEARN_PROGRESS_SUFFIX = b',"status":"generating"}\n\n'
+
+
+def _learn_progress_event(tokens: int) -> bytes:
+    return _LEARN_PROGRESS_PREFIX + str(tokens).encode() + _LEARN_PROGRESS_SUFFIX
+
+
+_LEARN_PROGRESS_START_EVENT = _learn_progress_event(0)
+
+
+def _learn_result_event(result: dict) -> bytes:
+    return _sse_event({'type': 'result', 'data': result})
+
+
+_WORD_DETAIL_LOOKUP_EVENT = _sse_event({'type': 'progress', 'status': 'Looking up word details...'})
+_ENGINE_UNAVAILABLE_EVENT = _sse_event({'type': 'error', 'message': 'Translation engine unavailable'})
+# (seconds elapsed, status frame) shown while word-detail-stream generates
+_WORD_DETAIL_PROGRESS_EVENTS = tuple(
+    (after, _sse_event({'type': 'progress', 'status': status}))
+    for after, status in (
+        (3, "Generating examples..."),
+        (8, "Building conjugations..."),
+        (15, "Finding related words..."),
+        (22, "Almost there..."),
+    )
+)
+
+# Emit a learn-stream progress event every N streamed LLM deltas
+LEARN_STREAM_PROGRESS_EVERY = 20
+
+# Seconds between word-detail-stream heartbeats, sent whether or not tokens
+# are arriving so proxies don't drop the connection while Ollama is queued
+WORD_DETAIL_HEARTBEAT_SECS = 1.5
+
+
 @router.post("/api/learn-stream", tags=["Learning"], summary="Stream a translation via SSE")
 async def learn_sentence_stream(
     request: Request,
@@ -32,7 +80,6 @@ async def learn_sentence_stream(
 ):
 
     rate_key = get_rate_limit_key(request)
-    rate_limit_cleanup()
     if not rate_limit_check(rate_key):
         raise HTTPException(429, "Too many requests. Please wait a minute.")
 
@@ -45,38 +92,39 @@ async def learn_sentence_stream(
     gender = req.speaker_gender or "neutral"
     formality = req.speaker_formality or "polite"
     ck = cache_key(req.sentence, req.target_language, gender, formality)
-    cached = cache_get(ck)
-    if cached:
+    cached_frame = cache_get_frame(ck, _learn_result_event)
+    if cached_frame:
         async def _cached_stream():
-            yield f"data: {json.dumps({'type': 'result', 'data': cached}, ensure_ascii=False)}\n\n"
+            yield cached_frame
         return StreamingResponse(_cached_stream(), media_type="text/event-stream")
 
     async def _generate():
         try:
-            increment_user_request()
+            yield _LEARN_PROGRESS_START_EVENT
 
-            yield f"data: {json.dumps({'type': 'progress', 'tokens': 0, 'status': 'generating'})}\n\n"
+            # Progress comes from the LLM's streamed deltas: the learn task reports
+            # them through ollama_progress, and None marks the task finished.
+            events: asyncio.Queue = asyncio.Queue()
 
-            learn_task = asyncio.create_task(
-                _learn_sentence_impl(request, req)
-            )
+            def _on_delta(n: int):
+                if n % LEARN_STREAM_PROGRESS_EVERY == 0:
+                    events.put_nowait(n)
 
-            tokens_est = 0
-            while not learn_task.done():
-                await asyncio.sleep(1.5)
-                tokens_est += 30
-                if not learn_task.done():
-                    yield f"data: {json.dumps({'type': 'progress', 'tokens': tokens_est, 'status': 'generating'})}\n\n"
+            progress_token = ollama_progress.set(_on_delta)
+            try:
+                learn_task = asyncio.create_task(
+                    _learn_sentence_impl(request, req)
+                )
+            finally:
+                ollama_progress.reset(progress_token)
+            learn_task.add_done_callback(lambda _: events.put_nowait(None))
 
-            result = learn_task.result()
-            if hasattr(result, 'body'):
-                result = json.loads(result.body)
+            while (tokens := await events.get()) is not None:
+                yield _learn_progress_event(tokens)
 
-            yield f"data: {json.dumps({'type': 'result', 'data': result}, ensure_ascii=False)}\n\n"
+            yield _learn_result_event(learn_task.result())
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
-        finally:
-            decrement_user_request()
+            yield _sse_event({'type': 'error', 'message': str(e)})
 
     return StreamingResponse(_generate(), media_type="text/event-stream",
                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -91,7 +139,6 @@ async def word_detail_stream(
     """SSE word-detail endpoint with dictionary-first fast path."""
 
     rate_key = get_rate_limit_key(request)
-    rate_limit_cleanup()
     if not rate_limit_check(rate_key):
         raise HTTPException(429, "Too many requests. Please wait a minute.")
 
@@ -109,7 +156,7 @@ async def word_detail_stream(
         logger.info("word-detail-stream cache hit", extra={"word": req.word, "lang": req.target_language})
 
         async def _cached():
-            yield f"data: {json.dumps({'type': 'result', 'data': cached}, ensure_ascii=False)}\n\n"
+            yield _sse_event({'type': 'result', 'data': cached})
 
         return StreamingResponse(
             _cached(),
@@ -128,7 +175,7 @@ async def word_detail_stream(
         word_cache_put(wc_key, result)
 
         async def _from_dict():
-            yield f"data: {json.dumps({'type': 'result', 'data': result}, ensure_ascii=False)}\n\n"
+            yield _sse_event({'type': 'result', 'data': result})
 
         return StreamingResponse(
             _from_dict(),
@@ -137,37 +184,88 @@ async def word_detail_stream(
         )
 
     async def _generate():
+        flight = None
+        result = None
+        settled = False  # False at exit means we were cancelled: let a waiting request take over
         try:
-            yield f"data: {json.dumps({'type': 'progress', 'status': 'Looking up word details...'})}\n\n"
-            llm_task = asyncio.create_task(llm_word_detail(req.word, req.meaning, req.target_language))
-
-            elapsed = 0.0
-            messages = [
-                (3, "Generating examples..."),
-                (8, "Building conjugations..."),
-                (15, "Finding related words..."),
-                (22, "Almost there..."),
-            ]
-            msg_idx = 0
-            while not llm_task.done():
-                await asyncio.sleep(1.5)
-                elapsed += 1.5
-                while msg_idx < len(messages) and elapsed >= messages[msg_idx][0]:
-                    yield f"data: {json.dumps({'type': 'progress', 'status': messages[msg_idx][1]})}\n\n"
-                    msg_idx += 1
-                yield f"data: {json.dumps({'type': 'heartbeat', 'elapsed': round(elapsed, 1)})}\n\n"
-
-            result = llm_task.result()
-            if result is None:
-                yield f"data: {json.dumps({'type': 'error', 'message': 'Translation engine unavailable'})}\n\n"
+            yield _WORD_DETAIL_LOOKUP_EVENT
+            start = time.monotonic()
+
+            waiter = asyncio.ensure_future(in_flight_wait(wc_key))
+            try:
+                while not (await asyncio.wait((waiter,), timeout=WORD_DETAIL_HEARTBEAT_SECS))[0]:
+                    elapsed = time.monotonic() - start
+                    yield _sse_event({'type': 'heartbeat', 'elapsed': round(elapsed, 1), 'tokens': 0})
+            finally:
+                waiter.cancel()
+            done = waiter.result()
+            if done is not None:
+                # The same word was already being generated; replay its result.
+                if done.result() is None:
+                    yield _ENGINE_UNAVAILABLE_EVENT
+                else:
+                    yield _sse_event({'type': 'result', 'data': done.result()})
                 return
+            flight = in_flight_begin(wc_key)
 
-            result = normalize_word_detail_payload(result)
+            messages = _WORD_DETAIL_PROGRESS_EVENTS
+            msg_idx = 0
+            text = ""
+            deltas = 0
+            next_beat = time.monotonic() + WORD_DETAIL_HEARTBEAT_SECS
+            stream = ollama_chat_stream(
+                word_detail_messages(req.word, req.meaning, req.target_language),
+                model=get_model_for_language(req.target_language), temperature=0.3, num_predict=512, timeout=45,
+            )
+            async with aclosing(stream):
+                # Pull each delta as a task so a heartbeat can go out while we
+                # wait for an Ollama slot or for the prompt to be evaluated.
+                pending = None
+                try:
+                    while True:
+                        if pending is None:
+                            pending = asyncio.ensure_future(anext(stream))
+                        await asyncio.wait((pending,), timeout=max(0.0, next_beat - time.monotonic()))
+                        now = time.monotonic()
+                        elapsed = now - start
+                        while msg_idx < len(messages) and elapsed >= messages[msg_idx][0]:
+                            yield messages[msg_idx][1]
+                            msg_idx += 1
+                        if now >= next_beat:
+                            yield _sse_event({'type': 'heartbeat', 'elapsed': round(elapsed, 1), 'tokens': deltas})
+                            next_beat = now + WORD_DETAIL_HEARTBEAT_SECS
+                        if not pending.done():
+                            continue
+                        fetched, pending = pending, None
+                        try:
+                            text += fetched.result()
+                        except StopAsyncIteration:
+                            break
+                        deltas += 1
+                        if json_object_complete(text):
+                            break
+                finally:
+                    # The generator can't be closed while a fetch is still running in it
+                    if pending is not None:
+                        pending.cancel()
+                        await asyncio.wait((pending,))
+
+            result = parse_word_detail(text)
             word_cache_put(wc_key, result)
-            yield f"data: {json.dumps({'type': 'result', 'data': result}, ensure_ascii=False)}\n\n"
+            settled = True
+            in_flight_end(wc_key, flight, result)
+            yield _sse_event({'type': 'result', 'data': result})
+        except httpx.HTTPError:
+            settled = True
+            logger.exception("word-detail-stream LLM error")
+            yield _ENGINE_UNAVAILABLE_EVENT
         except Exception as e:
+            settled = True
             logger.exception("word-detail-stream error")
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield _sse_event({'type': 'error', 'message': str(e)})
+        finally:
+            if flight is not None:
+                in_flight_end(wc_key, flight, result, None if settled else asyncio.CancelledError())
 
     return StreamingResponse(
         _generate(),
@@ -200,18 +298,24 @@ async def learn_multi(
         result = await _learn_sentence_impl(request, single_req)
         return {"mode": "single", "results": [{"sentence": parts[0], "result": result}]}
 
-    results = []
-    for sentence in parts[:10]:
-        single_req = SentenceRequest(
+    parts = parts[:10]
+    outcomes = await asyncio.gather(*(
+        _learn_sentence_impl(request, SentenceRequest(
             sentence=sentence,
             target_language=req.target_language,
             speaker_gender=req.speaker_gender,
             speaker_formality=req.speaker_formality,
-        )
-        try:
-            result = await _learn_sentence_impl(request, single_req)
+        ))
+        for sentence in parts
+    ), return_exceptions=True)
+
+    results = []
+    for sentence, result in zip(parts, outcomes):
+        if isinstance(result, HTTPException):
+            results.append({"sentence": sentence, "error": result.detail})
+        elif isinstance(result, BaseException):
+            raise result
+        else:
             results.append({"sentence": sentence, "result": result})
-        except HTTPException as e:
-            results.append({"sentence": sentence, "error": e.detail})
 
     return {"mode": "multi", "results": results}
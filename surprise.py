@@ -1,10 +1,9 @@
 """Surprise bank logic — pre-computation, save/load, endpoints."""
-import json
 import random
 import asyncio
-from typing import Optional
+import contextlib
 from pathlib import Path
-from collections import defaultdict
+from typing import Optional, Dict
 
 from log import get_logger
 
@@ -12,40 +11,68 @@ logger = get_logger("sentsei.surprise")
 
 from fastapi import APIRouter, HTTPException
 import httpx
+import orjson
 
 from models import SUPPORTED_LANGUAGES, SURPRISE_SENTENCES_EN, SURPRISE_SENTENCES_ZH
 from auth import APP_PASSWORD
+from cache import _write_file_atomic
+from llm import wait_ollama_idle, OLLAMA_NUM_PARALLEL
 
 router = APIRouter()
 
 # --- Surprise Bank State ---
-_surprise_bank: dict = defaultdict(list)
 _surprise_bank_filling = False
-_user_request_active: Optional[asyncio.Event] = None
-_user_request_count = 0
 SURPRISE_BANK_TARGET = 6
+# Banks below this size are topped back up to SURPRISE_BANK_TARGET
+SURPRISE_BANK_LOW = 2
+SURPRISE_BANK_REFILL_EVERY = 600  # seconds between producer passes when nothing wakes it
+SURPRISE_BANK_FILE = Path(__file__).parent / "surprise_bank.json"
+SURPRISE_BANK_FLUSH_DELAY = 5  # seconds of new entries batched into one disk write
+_bank_dirty = asyncio.Event()
+# Precompute batch size: all but one of Ollama's parallel slots, so a user
+# request arriving mid-batch still finds a free slot
+SURPRISE_PRECOMPUTE_BATCH = max(1, OLLAMA_NUM_PARALLEL - 1)
+# Every (target lang, input lang, sentence pool, bank key) the background tasks maintain
+_BANK_JOBS = tuple(
+    (lang, input_lang, pool, f"{lang}_{input_lang}")
+    for lang in SUPPORTED_LANGUAGES
+    for input_lang, pool in (("en", SURPRISE_SENTENCES_EN), ("zh", SURPRISE_SENTENCES_ZH))
+    if lang != input_lang
+)
 
 
-def _get_user_event() -> asyncio.Event:
-    global _user_request_active
-    if _user_request_active is None:
-        _user_request_active = asyncio.Event()
-        _user_request_active.set()
-    return _user_request_active
+class _BankQueue(asyncio.Queue):
+    """Precomputed entries for one bank, served first in, first out."""
 
+    def snapshot(self) -> list:
+        return list(self._queue)
 
-def increment_user_request():
-    global _user_request_count
-    _user_request_count += 1
-    _get_user_event().clear()
 
+# One queue per bank, all created up front: the request handler only looks
+# banks up, so a query-string input_lang can't add new ones. Past the startup
+# load, surprise_bank_producer is the only writer; requests take entries
+# with get_nowait(), which can't interleave with another request's take.
+_surprise_queues: Dict[str, _BankQueue] = {
+    bank_key: _BankQueue(maxsize=SURPRISE_BANK_TARGET) for _lang, _input, _pool, bank_key in _BANK_JOBS
+}
+# Set when a request leaves a bank below SURPRISE_BANK_LOW; wakes the producer
+_bank_low = asyncio.Event()
 
-def decrement_user_request():
-    global _user_request_count
-    _user_request_count -= 1
-    if _user_request_count <= 0:
-        _user_request_count = 0
-        _get_user_event().set()
+
+def _bank_put(bank_key: str, entry: dict) -> bool:
+    try:
+        _surprise_queues[bank_key].put_nowait(entry)
+    except asyncio.QueueFull:
+        return False
+    return True
+
+
+def get_surprise_bank_total() -> int:
+    return sum(queue.qsize() for queue in _surprise_queues.values())
+
+
+def is_surprise_bank_filling() -> bool:
+    return _surprise_bank_filling
 
 
 @router.get("/api/surprise", tags=["Surprise"], summary="Get a random pre-translated sentence")
@@ -53,10 +80,13 @@ async def get_surprise_sentence(lang: str, input_lang: str = "en"):
     if lang not in SUPPORTED_LANGUAGES:
         raise HTTPException(400, "Unsupported language")
 
-    bank_key = f"{lang}_{input_lang}"
-    if _surprise_bank[bank_key]:
-        idx = random.randrange(len(_surprise_bank[bank_key]))
-        entry = _surprise_bank[bank_key].pop(idx)
+    queue = _surprise_queues.get(f"{lang}_{input_lang}")
+    if queue is not None and not queue.empty():
+        entry = queue.get_nowait()
+        # Persist the removal too, or a restart would re-serve sentences already seen
+        _bank_dirty.set()
+        if queue.qsize() < SURPRISE_BANK_LOW:
+            _bank_low.set()
         return {
             "language": lang,
             "sentence": entry["sentence"],
@@ -70,120 +100,173 @@ async def get_surprise_sentence(lang: str, input_lang: str = "en"):
     picked = random.choice(pool)
     return {
         "language": lang,
-        "sentence": picked["sentence"],
-        "difficulty": picked["difficulty"],
-        "category": picked["category"],
+        "sentence": picked.sentence,
+        "difficulty": picked.difficulty,
+        "category": picked.category,
     }
 
 
 @router.get("/api/surprise-bank-status", tags=["System"], summary="Surprise bank fill status")
 async def surprise_bank_status():
-    status = {}
-    for key, items in _surprise_bank.items():
-        status[key] = len(items)
+    status = {key: queue.qsize() for key, queue in _surprise_queues.items()}
     return {"filling": _surprise_bank_filling, "banks": status}
 
 
 # --- Background Tasks ---
 
+_precompute_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_precompute_client() -> httpx.AsyncClient:
+    """Keep-alive client for the precompute calls to our own /api/learn."""
+    global _precompute_client
+    if _precompute_client is None or _precompute_client.is_closed:
+        _precompute_client = httpx.AsyncClient(
+            base_url="http://127.0.0.1:8847",
+            timeout=180,
+            headers={"X-App-Password": APP_PASSWORD},
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+        )
+    return _precompute_client
+
+
+async def close_precompute_client():
+    global _precompute_client
+    if _precompute_client is not None:
+        await _precompute_client.aclose()
+        _precompute_client = None
+
+
 async def _precompute_one(sentence: str, lang: str, input_lang: str):
     try:
-        async with httpx.AsyncClient(timeout=180) as client:
-            resp = await client.post(
-                "http://127.0.0.1:8847/api/learn",
-                json={
-                    "sentence": sentence,
-                    "target_language": lang,
-                    "input_language": input_lang,
-                    "speaker_gender": "neutral",
-                    "speaker_formality": "polite",
-                },
-                headers={"X-App-Password": APP_PASSWORD},
-            )
-            if resp.status_code == 200:
-                return resp.json()
+        resp = await _get_precompute_client().post(
+            "/api/learn",
+            json={
+                "sentence": sentence,
+                "target_language": lang,
+                "input_language": input_lang,
+                "speaker_gender": "neutral",
+                "speaker_formality": "polite",
+            },
+        )
+        if resp.status_code == 200:
+            return resp.json()
     except Exception:
         logger.exception("Surprise bank precompute error", extra={"component": "surprise-bank"})
     return None
 
 
-async def fill_surprise_bank_task():
+async def surprise_bank_producer():
+    """Keep every bank topped up: the single producer behind the bank queues.
+
+    The first pass fills every bank to SURPRISE_BANK_TARGET. Afterwards it
+    sleeps until a request leaves a bank below SURPRISE_BANK_LOW (or
+    SURPRISE_BANK_REFILL_EVERY passes) and refills the banks that are low.
+    """
     global _surprise_bank_filling
     await asyncio.sleep(10)
-    _surprise_bank_filling = True
-    logger.info("Starting surprise bank pre-computation", extra={"component": "surprise-bank"})
-    count = 0
-    for lang in SUPPORTED_LANGUAGES:
-        for input_lang, pool in [("en", SURPRISE_SENTENCES_EN), ("zh", SURPRISE_SENTENCES_ZH)]:
-            if lang == "en" and input_lang == "en": continue
-            if lang == "zh" and input_lang == "zh": continue
-            bank_key = f"{lang}_{input_lang}"
-            samples = random.sample(pool, min(SURPRISE_BANK_TARGET, len(pool)))
-            for s in samples:
-                if len(_surprise_bank[bank_key]) >= SURPRISE_BANK_TARGET: break
-                await _get_user_event().wait()
-                result = await _precompute_one(s["sentence"], lang, input_lang)
-                if result:
-                    _surprise_bank[bank_key].append({
-                        "sentence": s["sentence"],
-                        "difficulty": s.get("difficulty", "medium"),
-                        "category": s.get("category", "general"),
-                        "result": result,
-                    })
-                    count += 1
-                    if count % 10 == 0:
-                        save_surprise_bank()
-                await asyncio.sleep(0.5)
-    _surprise_bank_filling = False
-    logger.info("Surprise bank pre-computation complete", extra={"component": "surprise-bank", "count": count})
-    save_surprise_bank()
-
-
-async def refill_surprise_bank_task():
+    below = SURPRISE_BANK_TARGET
     while True:
-        await asyncio.sleep(600)
-        for lang in SUPPORTED_LANGUAGES:
-            for input_lang, pool in [("en", SURPRISE_SENTENCES_EN), ("zh", SURPRISE_SENTENCES_ZH)]:
-                if lang == "en" and input_lang == "en": continue
-                if lang == "zh" and input_lang == "zh": continue
-                bank_key = f"{lang}_{input_lang}"
-                if len(_surprise_bank[bank_key]) < 2:
-                    samples = random.sample(pool, min(4, len(pool)))
-                    for s in samples:
-                        await _get_user_event().wait()
-                        result = await _precompute_one(s["sentence"], lang, input_lang)
-                        if result:
-                            _surprise_bank[bank_key].append({
-                                "sentence": s["sentence"],
-                                "difficulty": s.get("difficulty", "medium"),
-                                "category": s.get("category", "general"),
-                                "result": result,
-                            })
-                        await asyncio.sleep(1)
-        save_surprise_bank()
+        # Cleared before the scan, so a pop during the pass triggers another one
+        _bank_low.clear()
+        jobs = [
+            (lang, input_lang, pool, bank_key) for lang, input_lang, pool, bank_key in _BANK_JOBS
+            if _surprise_queues[bank_key].qsize() < below
+        ]
+        if jobs:
+            _surprise_bank_filling = True
+            logger.info("Starting surprise bank pre-computation", extra={"component": "surprise-bank", "count": len(jobs)})
+            count = 0
+            try:
+                for lang, input_lang, pool, bank_key in jobs:
+                    need = SURPRISE_BANK_TARGET - _surprise_queues[bank_key].qsize()
+                    if need > 0:
+                        count += await _precompute_into_bank(random.sample(pool, min(need, len(pool))), lang, input_lang)
+            finally:
+                _surprise_bank_filling = False
+            logger.info("Surprise bank pre-computation complete", extra={"component": "surprise-bank", "count": count})
+        below = SURPRISE_BANK_LOW
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(_bank_low.wait(), SURPRISE_BANK_REFILL_EVERY)
 
 
-def save_surprise_bank():
+async def _precompute_into_bank(samples: list, lang: str, input_lang: str) -> int:
+    """Precompute *samples* into their bank, SURPRISE_PRECOMPUTE_BATCH at a time; returns how many were added.
+
+    Each batch is only started while no user request is waiting on the model.
+    """
+    bank_key = f"{lang}_{input_lang}"
+    added = 0
+    for i in range(0, len(samples), SURPRISE_PRECOMPUTE_BATCH):
+        batch = samples[i:i + SURPRISE_PRECOMPUTE_BATCH]
+        await wait_ollama_idle()
+        results = await asyncio.gather(*(_precompute_one(s.sentence, lang, input_lang) for s in batch))
+        for s, result in zip(batch, results):
+            if result and _bank_put(bank_key, {
+                "sentence": s.sentence,
+                "difficulty": s.difficulty,
+                "category": s.category,
+                "result": result,
+            }):
+                added += 1
+        if added:
+            _bank_dirty.set()
+        await asyncio.sleep(1)
+    return added
+
+
+async def surprise_bank_flusher():
+    """Write the bank to disk at most once per SURPRISE_BANK_FLUSH_DELAY while entries are added or served."""
+    while True:
+        await _bank_dirty.wait()
+        await asyncio.sleep(SURPRISE_BANK_FLUSH_DELAY)
+        _bank_dirty.clear()
+        # Snapshot on the event loop; encoding and the file write happen off it
+        await asyncio.to_thread(_write_surprise_bank, _surprise_bank_snapshot())
+
+
+def _surprise_bank_snapshot() -> dict:
+    return {key: queue.snapshot() for key, queue in _surprise_queues.items() if not queue.empty()}
+
+
+def _write_surprise_bank(data: dict):
     try:
-        bank_file = Path(__file__).parent / "surprise_bank.json"
-        data = {k: v for k, v in _surprise_bank.items() if v}
-        bank_file.write_text(json.dumps(data, ensure_ascii=False))
+        _write_file_atomic(SURPRISE_BANK_FILE, orjson.dumps(data))
         logger.info("Surprise bank saved to disk", extra={"component": "surprise-bank", "count": sum(len(v) for v in data.values())})
     except Exception:
         logger.exception("Failed to save surprise bank", extra={"component": "surprise-bank"})
 
 
-def load_surprise_bank():
-    bank_file = Path(__file__).parent / "surprise_bank.json"
-    if bank_file.exists():
+def save_surprise_bank():
+    _bank_dirty.clear()
+    _write_surprise_bank(_surprise_bank_snapshot())
+
+
+def flush_surprise_bank():
+    """Save any entries the flusher has not written yet (e.g. on shutdown)."""
+    if _bank_dirty.is_set():
+        save_surprise_bank()
+
+
+def _read_surprise_bank() -> dict:
+    if SURPRISE_BANK_FILE.exists():
         try:
-            data = json.loads(bank_file.read_text())
-            for key, items in data.items():
-                _surprise_bank[key] = items
-            logger.info("Loaded surprise bank from disk", extra={"component": "surprise-bank", "count": sum(len(v) for v in data.values())})
+            return orjson.loads(SURPRISE_BANK_FILE.read_bytes())
         except Exception:
             logger.exception("Failed to load surprise bank", extra={"component": "surprise-bank"})
+    return {}
+
+
+async def load_surprise_bank():
+    """Read the saved bank off the event loop, then queue its entries on it."""
+    data = await asyncio.to_thread(_read_surprise_bank)
+    count = 0
+    for key, items in data.items():
+        if key in _surprise_queues:
+            count += sum(_bank_put(key, item) for item in items)
+    if count:
+        logger.info("Loaded surprise bank from disk", extra={"component": "surprise-bank", "count": count})
 
 
-def get_surprise_bank():
-    return _surprise_bank
+def get_surprise_bank() -> dict:
+    return _surprise_bank_snapshot()
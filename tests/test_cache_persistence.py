@@ -0,0 +1,29 @@
+"""Tests for background saving of the on-disk caches."""
+import asyncio
+
+import cache
+
+
+def test_failed_background_save_leaves_cache_dirty(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_FILE", tmp_path / "missing-dir" / "translation_cache.json")
+    monkeypatch.setattr(cache, "_cache_dirty", True)
+
+    async def main():
+        cache.save_cache(background=True)
+        await cache.wait_file_writes()
+
+    asyncio.run(main())
+    assert cache.is_cache_dirty()
+
+
+def test_background_save_clears_dirty_flag(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_FILE", tmp_path / "translation_cache.json")
+    monkeypatch.setattr(cache, "_cache_dirty", True)
+
+    async def main():
+        cache.save_cache(background=True)
+        await cache.wait_file_writes()
+
+    asyncio.run(main())
+    assert not cache.is_cache_dirty()
+    assert cache.CACHE_FILE.exists()
@@ -0,0 +1,61 @@
+"""Tests for the lazily loaded CC-CEDICT dictionary."""
+import threading
+
+import pytest
+
+import llm
+
+
+CEDICT_TXT = (
+    "# test dictionary\n"
+    "電 电 [dian4] /electric/\n"
+    "電腦 电脑 [dian4 nao3] /computer/CL:臺|台[tai2]/\n"
+)
+
+
+@pytest.fixture()
+def fresh_cedict(tmp_path, monkeypatch):
+    txt = tmp_path / "cedict.txt"
+    txt.write_text(CEDICT_TXT, encoding="utf-8")
+    monkeypatch.setattr(llm, "_cedict_txt_path", txt)
+    monkeypatch.setattr(llm, "_cedict_path", tmp_path / "missing.json")
+    monkeypatch.setattr(llm, "_cedict_loaded", False)
+    monkeypatch.setattr(llm, "_cedict_data", {})
+    monkeypatch.setattr(llm, "_cedict_entries", {})
+    llm._cedict_lookup_loaded.cache_clear()
+    yield
+    llm._cedict_lookup_loaded.cache_clear()
+
+
+def _definitions(word):
+    llm._ensure_cedict_loaded()
+    entry = llm._cedict_entries.get(word)
+    return entry and entry["definitions"]
+
+
+def test_lookup_during_load_waits_for_full_dictionary(fresh_cedict, monkeypatch):
+    first_entry = threading.Event()
+    release = threading.Event()
+    register = llm._register_cedict_entry
+
+    def slow_register(*args):
+        register(*args)
+        first_entry.set()
+        release.wait(5)
+
+    monkeypatch.setattr(llm, "_register_cedict_entry", slow_register)
+
+    loader = threading.Thread(target=llm._ensure_cedict_loaded)
+    loader.start()
+    assert first_entry.wait(5)
+
+    results = []
+    lookup = threading.Thread(target=lambda: results.append(_definitions("電腦")))
+    lookup.start()
+    lookup.join(0.1)
+    assert results == []  # blocked until the load finishes
+
+    release.set()
+    loader.join(5)
+    lookup.join(5)
+    assert results == [["computer", "CL:臺|台[tai2]"]]
@@ -0,0 +1,53 @@
+"""Tests for paging through the feedback log."""
+import orjson
+import pytest
+
+import feedback
+
+
+@pytest.fixture()
+def log(tmp_path, monkeypatch):
+    path = tmp_path / "feedback.jsonl"
+    monkeypatch.setattr(feedback, "FEEDBACK_FILE", path)
+    monkeypatch.setattr(feedback, "FEEDBACK_READ_BLOCK", 16)  # force many backwards steps
+    monkeypatch.setattr(feedback, "_feedback_count", (0, 0, 0))
+    return path
+
+
+def _write(path, messages):
+    with open(path, "ab") as f:
+        for message in messages:
+            f.write(orjson.dumps({"message": message}) + b"\n")
+
+
+def _page(offset, limit):
+    total, entries = feedback._read_feedback_page(offset, limit)
+    return total, [entry["message"] for entry in entries]
+
+
+def test_pages_are_newest_first(log):
+    _write(log, [f"entry {i}" for i in range(10)])
+
+    assert _page(0, 3) == (10, ["entry 9", "entry 8", "entry 7"])
+    assert _page(8, 5) == (10, ["entry 1", "entry 0"])
+    assert _page(10, 5) == (10, [])
+    assert _page(0, 0) == (10, [])
+
+
+def test_count_follows_appends_and_rewrites(log):
+    _write(log, ["a", "b"])
+    assert _page(0, 1) == (2, ["b"])
+
+    _write(log, ["c"])
+    assert _page(0, 5) == (3, ["c", "b", "a"])
+
+    assert feedback._delete_feedback_line(0)
+    assert _page(0, 5) == (2, ["b", "a"])
+
+
+def test_blank_and_unparseable_lines(log):
+    log.write_bytes(b'{"message": "first"}\n\nnot json\n{"message": "last"}')
+
+    total, messages = _page(0, 10)
+    assert total == 3
+    assert messages == ["last", "first"]
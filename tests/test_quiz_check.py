@@ -0,0 +1,71 @@
+"""Tests for the /api/quiz-check grading shortcuts."""
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import quiz_routes
+from auth import require_password
+from cache import store_quiz_answer
+
+
+@pytest.fixture()
+def graded(monkeypatch):
+    """Calls that reached the LLM grader (which always answers 'good')."""
+    calls = []
+
+    async def fake_grade(quiz, answer):
+        calls.append(answer)
+        return {"score": "good", "feedback": "Close enough."}
+
+    monkeypatch.setattr(quiz_routes, "_grade_quiz_answer", fake_grade)
+    monkeypatch.setattr(quiz_routes, "rate_limit_check", lambda key: True)
+    monkeypatch.setattr(quiz_routes, "quiz_cache_get", lambda key: None)
+    monkeypatch.setattr(quiz_routes, "quiz_cache_put", lambda key, value: None)
+    return calls
+
+
+@pytest.fixture()
+def client():
+    app = FastAPI()
+    app.include_router(quiz_routes.router)
+    app.dependency_overrides[require_password] = lambda: None
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _check(client, answer, answer_en="to walk", answer_zh="走路"):
+    store_quiz_answer("quiz-test", {
+        "sentence": "歩く", "language": "ja", "answer_en": answer_en, "answer_zh": answer_zh,
+        "created_at": time.time(),
+    })
+    resp = client.post("/api/quiz-check", json={"quiz_id": "quiz-test", "answer": answer, "target_language": "ja"})
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_exact_match_skips_grader(client, graded):
+    result = _check(client, " To walk! ")
+    assert result["score"] == "perfect"
+    assert result["correct"] is True
+    assert graded == []
+
+
+def test_single_cjk_character_exact_match(client, graded):
+    result = _check(client, "走", answer_zh="走")
+    assert result["score"] == "perfect"
+    assert graded == []
+
+
+def test_too_short_latin_answer_skips_grader(client, graded):
+    result = _check(client, "a")
+    assert result["score"] == "wrong"
+    assert result["feedback"] == "Answer is too short."
+    assert graded == []
+
+
+def test_single_cjk_character_is_graded(client, graded):
+    result = _check(client, "走")
+    assert result["score"] == "good"
+    assert graded == ["走"]
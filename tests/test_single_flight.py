@@ -0,0 +1,39 @@
+"""Tests for in-flight request coalescing."""
+import asyncio
+
+from cache import single_flight
+
+
+def test_followers_share_leader_result():
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def main():
+        return await asyncio.gather(*(single_flight("shared", factory) for _ in range(3)))
+
+    assert asyncio.run(main()) == ["done", "done", "done"]
+    assert len(calls) == 1
+
+
+def test_cancelled_leader_hands_off_to_follower():
+    started = []
+
+    async def factory():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        leader = asyncio.create_task(single_flight("handoff", factory))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(single_flight("handoff", factory))
+        await asyncio.sleep(0.01)
+        leader.cancel()  # e.g. the leader's client disconnected
+        return await follower
+
+    assert asyncio.run(main()) == "done"
+    assert len(started) == 2
@@ -1,4 +1,5 @@
 """Tests for dedicated SRS API routes."""
+import json
 import time
 
 import pytest
@@ -356,3 +357,79 @@ def test_same_sentence_different_lang(client, auth_headers):
     client.post("/api/srs/item", headers=auth_headers, json=item_ko)
     deck = client.get("/api/srs/deck", headers=auth_headers).json()
     assert len(deck) == 2
+
+
+def test_legacy_srs_deck_blob_is_migrated(client, auth_headers):
+    """A user_data 'srs_deck' blob from before srs_items is moved over on init."""
+    conn = auth.get_db()
+    user_id = conn.execute("SELECT id FROM users WHERE username = 'alice'").fetchone()["id"]
+    legacy = [
+        {"sentence": "後", "lang": "ja", "translation": "later", "nextReview": 20, "reviewCount": 2},
+        {"sentence": "先", "lang": "ja", "translation": "first", "nextReview": 10, "reviewCount": 1},
+    ]
+    with conn:
+        conn.execute(
+            "INSERT INTO user_data (user_id, data_key, data_json, updated_at) VALUES (?, 'srs_deck', ?, ?)",
+            (user_id, json.dumps(legacy), time.time()),
+        )
+    auth.init_user_db()
+
+    deck = client.get("/api/srs/deck", headers=auth_headers).json()
+    assert deck == legacy
+    assert conn.execute("SELECT COUNT(*) FROM user_data WHERE data_key = 'srs_deck'").fetchone()[0] == 0
+
+
+def test_put_deck_count_merges_duplicates(client, auth_headers):
+    """Items sharing sentence+lang collapse into one row, and count reflects that."""
+    item = {"sentence": "重複", "lang": "ja", "translation": "dup", "nextReview": 1}
+    resp = client.put("/api/srs/deck", headers=auth_headers, json=[item, {**item, "translation": "dup2"}])
+    assert resp.status_code == 200
+    assert resp.json()["count"] == 1
+    assert len(client.get("/api/srs/deck", headers=auth_headers).json()) == 1
+
+
+def test_put_deck_too_large_rejected(client, auth_headers, monkeypatch):
+    """Oversized decks are rejected before anything is replaced."""
+    import srs_routes
+
+    client.put("/api/srs/deck", headers=auth_headers, json=[{"sentence": "keep", "lang": "en"}])
+    monkeypatch.setattr(srs_routes, "SRS_DECK_MAX_ITEMS", 2)
+    deck = [{"sentence": str(i), "lang": "en"} for i in range(3)]
+    assert client.put("/api/srs/deck", headers=auth_headers, json=deck).status_code == 400
+
+    big = [{"sentence": "x" * 600_000, "lang": "en"}, {"sentence": "y" * 600_000, "lang": "en"}]
+    assert client.put("/api/srs/deck", headers=auth_headers, json=big).status_code == 400
+    assert client.post("/api/srs/item", headers=auth_headers, json={"sentence": "a", "lang": "en"}).status_code == 200
+    assert client.post("/api/srs/item", headers=auth_headers, json={"sentence": "b", "lang": "en"}).status_code == 400
+    assert {i["sentence"] for i in client.get("/api/srs/deck", headers=auth_headers).json()} == {"keep", "a"}
+
+
+def test_user_data_endpoint_rejects_srs_deck_key(client, auth_headers):
+    """The generic user-data store must not accept a deck that /api/srs/deck never reads."""
+    from routes import router as routes_router
+
+    app = FastAPI()
+    app.include_router(routes_router)
+    with TestClient(app) as user_data_client:
+        resp = user_data_client.put("/api/user-data/srs_deck", headers=auth_headers, json={"data": []})
+    assert resp.status_code == 400
+
+
+def test_put_deck_roundtrips_order_and_extra_fields(client, auth_headers):
+    """GET returns the deck as it was PUT: same order, unknown keys and nulls kept."""
+    deck = [
+        {"sentence": "遅", "lang": "ja", "nextReview": 30, "note": "from a song", "starred": True},
+        {"sentence": "早", "lang": "ja", "nextReview": 10, "interval": None, "tags": ["n5"]},
+        {"sentence": "中", "lang": "ja", "nextReview": 20},
+    ]
+    assert client.put("/api/srs/deck", headers=auth_headers, json=deck).status_code == 200
+    assert client.get("/api/srs/deck", headers=auth_headers).json() == deck
+
+    client.post("/api/srs/item", headers=auth_headers, json={"sentence": "新", "lang": "ja", "nextReview": 1})
+    client.post("/api/srs/review", headers=auth_headers, json={
+        "sentence": "早", "lang": "ja", "interval": 5, "easeFactor": 2.5, "nextReview": 40, "reviewCount": 1,
+    })
+    result = client.get("/api/srs/deck", headers=auth_headers).json()
+    assert [item["sentence"] for item in result] == ["遅", "早", "中", "新"]
+    assert result[1]["interval"] == 5
+    assert result[1]["tags"] == ["n5"]
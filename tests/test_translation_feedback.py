@@ -0,0 +1,59 @@
+"""Tests for feedback-driven eviction of cached translations."""
+import asyncio
+
+import pytest
+
+import cache
+import llm
+
+
+MESSAGES = [{"role": "user", "content": "translate: good morning"}]
+RESULT = {"original_sentence": "good morning", "translation": "BAD", "target_language": "ja"}
+
+
+@pytest.fixture()
+def llm_calls(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "BAD_TRANSLATIONS_FILE", tmp_path / "bad_translations.json")
+    monkeypatch.setattr(cache, "_bad_translations", {})
+    monkeypatch.setattr(cache, "_maybe_save_cache", lambda: None)
+    monkeypatch.setattr(cache, "_llm_cache", cache.OrderedDict())
+    monkeypatch.setattr(cache, "_translation_cache", cache.OrderedDict())
+    monkeypatch.setattr(cache, "_translation_llm_keys", {})
+    calls = []
+
+    async def fake_request(model, messages, *args, **kwargs):
+        calls.append(model)
+        return "BAD"
+
+    monkeypatch.setattr(llm, "_ollama_chat_request", fake_request)
+    return calls
+
+
+def _chat():
+    return asyncio.run(llm.ollama_chat(MESSAGES, model="test-model"))
+
+
+def test_marking_translation_bad_evicts_llm_completion(llm_calls):
+    ck = cache.cache_key("good morning", "ja", "neutral", "polite")
+    assert _chat() == "BAD"
+    cache.cache_put(ck, dict(RESULT), llm_key=cache.llm_cache_key("test-model", 0.3, 2048, MESSAGES))
+    assert _chat() == "BAD"
+    assert len(llm_calls) == 1  # served from the LLM cache
+
+    cache.mark_translation_bad("good morning", "BAD", "ja")
+
+    assert cache.cache_get(ck) is None
+    _chat()
+    assert len(llm_calls) == 2
+
+
+def test_flagged_translation_is_not_recached_from_llm_cache(llm_calls):
+    cache.mark_translation_bad("good morning", "BAD", "ja")
+    ck = cache.cache_key("good morning", "ja", "neutral", "polite")
+
+    _chat()
+    cache.cache_put(ck, dict(RESULT), llm_key=cache.llm_cache_key("test-model", 0.3, 2048, MESSAGES))
+
+    assert cache.cache_get(ck) is None
+    _chat()
+    assert len(llm_calls) == 2